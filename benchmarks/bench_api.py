@@ -0,0 +1,277 @@
+"""
+End to end benchmarks of the client against the local mock API of `mock_server.py`.
+
+Measures per-call latency, pages per second, peak memory while paginating, throughput
+under concurrency and behaviour with injected 40100/50000 errors. Results are written
+as JSON so that two versions can be compared:
+
+    python benchmarks/bench_api.py --output before.json
+    python benchmarks/bench_api.py --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# run from a checkout without installing the package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_server import MockConfig
+from mock_server import MockServer
+
+from tiktok_marketing import AsyncTikTokClient
+from tiktok_marketing import TikTokClient
+from tiktok_marketing.instrumentation import MetricsCollector
+from tiktok_marketing.jsonlib import default_backend
+from tiktok_marketing.retry import RetryPolicy
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+ADVERTISER_ID = 1
+LIBRARY_ID = 2
+
+# lower is better for these metrics when comparing runs
+LOWER_IS_BETTER = ("ms", "seconds", "bytes")
+
+
+def build_client(server: MockServer, facade_class: type = TikTokClient, **kwargs) -> TikTokClient:
+    facade = facade_class("app_id", "secret", access_token="token", **kwargs)
+    facade.client.API_URL = server.url
+    return facade
+
+
+def summarize(samples: list) -> dict:
+    """This method returns latency statistics in milliseconds."""
+    samples = sorted(samples)
+    quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return dict(
+        calls=len(samples),
+        mean_ms=statistics.fmean(samples) * 1000,
+        p50_ms=quantiles[49] * 1000,
+        p95_ms=quantiles[94] * 1000,
+        p99_ms=quantiles[98] * 1000,
+        min_ms=samples[0] * 1000,
+    )
+
+
+def timed(call, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_latency(server: MockServer, args) -> dict:
+    calls = {
+        "user.info": lambda client: client.user.info(),
+        "ad_account.get_advertiser_info": lambda client: client.ad_account.get_advertiser_info(list(range(50))),
+        "pages.get_pages": lambda client: client.pages.get_pages(ADVERTISER_ID, LIBRARY_ID, page_size=args.page_size),
+        "leads.get_subscriptions": lambda client: client.leads.get_subscriptions(1, page_size=args.page_size),
+        "leads.create_test_lead": lambda client: client.leads.create_test_lead(3, ADVERTISER_ID, LIBRARY_ID),
+    }
+    results = {}
+    with build_client(server) as client:
+        for name, call in calls.items():
+            call(client)  # warm up the connection
+            results[name] = summarize(timed(lambda: call(client), args.repeat))
+    return results
+
+
+def bench_pagination(server: MockServer, args) -> dict:
+    results = {}
+    variants = {
+        "iter_pages": dict(prefetch=False),
+        "iter_pages prefetch": dict(prefetch=True),
+        "iter_pages typed": dict(prefetch=True, typed=True),
+    }
+    with build_client(server) as client:
+        for name, kwargs in variants.items():
+            started = time.perf_counter()
+            records = sum(1 for _ in client.pages.iter_pages(ADVERTISER_ID, LIBRARY_ID, page_size=args.page_size, **kwargs))
+            seconds = time.perf_counter() - started
+            results[name] = dict(
+                seconds=seconds,
+                records=records,
+                pages_per_second=server.config.total_pages / seconds,
+                records_per_second=records / seconds,
+            )
+
+        started = time.perf_counter()
+        pages = client.pages.get_all_pages(ADVERTISER_ID, LIBRARY_ID, max_workers=args.workers, page_size=args.page_size)
+        seconds = time.perf_counter() - started
+        results["get_all_pages"] = dict(
+            seconds=seconds,
+            records=len(pages),
+            pages_per_second=server.config.total_pages / seconds,
+            records_per_second=len(pages) / seconds,
+        )
+    return results
+
+
+def bench_memory(server: MockServer, args) -> dict:
+    results = {}
+    with build_client(server) as client:
+        for name, typed in (("pages dict", False), ("pages typed", True)):
+            tracemalloc.start()
+            pages = list(client.pages.iter_pages(ADVERTISER_ID, LIBRARY_ID, page_size=args.page_size, typed=typed))
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = dict(records=len(pages), retained_bytes=current, peak_bytes=peak)
+            del pages
+    return results
+
+
+def bench_concurrency(server: MockServer, args) -> dict:
+    results = {}
+    for workers in args.concurrency:
+        with build_client(server, pool_maxsize=workers) as client:
+            client.user.info()
+            started = time.perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(lambda _: client.user.info(), range(args.requests)))
+            seconds = time.perf_counter() - started
+            results[f"threads {workers}"] = dict(seconds=seconds, requests_per_second=args.requests / seconds)
+
+    if httpx is None:
+        return results
+
+    async def run(workers: int) -> float:
+        async with build_client(server, AsyncTikTokClient, max_connections=workers) as client:
+            await client.user.info()
+            semaphore = asyncio.Semaphore(workers)
+
+            async def call():
+                async with semaphore:
+                    await client.user.info()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(call() for _ in range(args.requests)))
+            return time.perf_counter() - started
+
+    for workers in args.concurrency:
+        seconds = asyncio.run(run(workers))
+        results[f"asyncio {workers}"] = dict(seconds=seconds, requests_per_second=args.requests / seconds)
+    return results
+
+
+def bench_errors(server: MockServer, args) -> dict:
+    config = server.config
+    config.error_rate, config.throttle_rate = args.error_rate, args.throttle_rate
+    metrics = MetricsCollector()
+    retry_policy = RetryPolicy(max_retries=5, backoff_factor=0.001, max_backoff=0.01)
+    failed = 0
+    try:
+        with build_client(server, retry_policy=retry_policy, hooks=[metrics]) as client:
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                try:
+                    client.user.info()
+                except Exception:
+                    failed += 1
+            seconds = time.perf_counter() - started
+    finally:
+        config.error_rate = config.throttle_rate = 0.0
+
+    endpoint = metrics.snapshot().get("user/info/", {})
+    return {
+        "user.info with retries": dict(
+            seconds=seconds,
+            requests_per_second=args.requests / seconds,
+            failed=failed,
+            http_requests=endpoint.get("requests", 0),
+            retries=endpoint.get("retries", 0),
+            throttles=endpoint.get("throttles", 0),
+        )
+    }
+
+
+BENCHMARKS = {
+    "latency": bench_latency,
+    "pagination": bench_pagination,
+    "memory": bench_memory,
+    "concurrency": bench_concurrency,
+    "errors": bench_errors,
+}
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """This method prints the change of every numeric metric against a previous run."""
+    for group, benchmarks in results["results"].items():
+        for name, metrics in benchmarks.items():
+            previous = baseline.get("results", {}).get(group, {}).get(name, {})
+            for metric, value in metrics.items():
+                before = previous.get(metric)
+                if not isinstance(value, (int, float)) or not before:
+                    continue
+                change = (value - before) / before * 100
+                better = change < 0 if metric.endswith(LOWER_IS_BETTER) else change > 0
+                flag = "" if abs(change) < 5 else (" better" if better else " WORSE")
+                print(f"{group:12} {name:32} {metric:20} {before:12.2f} -> {value:12.2f} {change:+7.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds added by the mock to every response")
+    parser.add_argument("--total-pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--payload-size", type=int, default=0, help="bytes of padding per record")
+    parser.add_argument("--repeat", type=int, default=50, help="calls per endpoint for the latency benchmark")
+    parser.add_argument("--requests", type=int, default=500, help="calls for the concurrency and error benchmarks")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--throttle-rate", type=float, default=0.05)
+    parser.add_argument("--output", help="file to write the JSON results to, stdout by default")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    # the injected errors are expected
+    logging.getLogger("tiktok_marketing").setLevel(logging.ERROR)
+    config = MockConfig(
+        latency=args.latency,
+        total_pages=args.total_pages,
+        page_size=args.page_size,
+        payload_size=args.payload_size,
+    )
+    results = dict(
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        python=sys.version.split()[0],
+        platform=platform.platform(),
+        httpx=getattr(httpx, "__version__", None),
+        json_backend=default_backend.name,
+        config=dict(vars(args)),
+        results={},
+    )
+    with MockServer(config) as server:
+        for name in args.benchmarks:
+            print(f"running {name}", file=sys.stderr)
+            results["results"][name] = BENCHMARKS[name](server, args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
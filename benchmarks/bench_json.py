@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of Client.parse_response with every installed JSON backend.
+
+    python benchmarks/bench_json.py --records 20000 --repeat 20
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+import requests
+
+# run from a checkout without installing the package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tiktok_marketing.client import Client
+from tiktok_marketing.jsonlib import BACKENDS
+
+
+def build_response(records: int) -> requests.Response:
+    page = dict(
+        status="PUBLISHED",
+        duplicate_id=6854791294359699461,
+        user_id=6844401689412666374,
+        title="page_title",
+        preview_url="http://preview.page.url",
+        thumbnail="http://preview.page.thumbnail",
+        create_time=1596012542,
+        update_time=1597055449,
+        publish_time=1597055450,
+        page_id=6854821673904898054,
+        template_id=6852135057059610630,
+    )
+    body = dict(
+        code=0,
+        message="OK",
+        request_id="202201010000000000",
+        data=dict(
+            page_info=dict(page=1, page_size=records, total_number=records, total_page=1),
+            list=[dict(page, page_id=page["page_id"] + i) for i in range(records)],
+        ),
+    )
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    response = build_response(args.records)
+    # what parse_response did before the pluggable backends
+    results = {"requests .json()": min(timeit.repeat(response.json, number=1, repeat=args.repeat))}
+    for name in BACKENDS:
+        try:
+            client = Client(json_backend=name)
+        except ImportError:
+            continue
+        seconds = min(timeit.repeat(lambda: client.parse_response(response), number=1, repeat=args.repeat))
+        results[name] = seconds
+
+    baseline = results["requests .json()"]
+    print(f"{len(response.content) / 1e6:.1f} MB, {args.records} records")
+    for name, seconds in results.items():
+        print(f"{name:18} {seconds * 1000:8.2f} ms  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
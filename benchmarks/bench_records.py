@@ -0,0 +1,90 @@
+"""
+Memory per record of plain dicts versus records.PageRecord and records.LeadRecord.
+
+    python benchmarks/bench_records.py --records 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+# run from a checkout without installing the package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tiktok_marketing.records import LeadRecord
+from tiktok_marketing.records import PageRecord
+
+
+def build_page(i: int) -> dict:
+    return dict(
+        status="PUBLISHED",
+        duplicate_id=6854791294359699461,
+        user_id=6844401689412666374,
+        title="page_title",
+        preview_url="http://preview.page.url",
+        thumbnail="http://preview.page.thumbnail",
+        create_time=1596012542,
+        update_time=1597055449,
+        publish_time=1597055450,
+        page_id=6854821673904898054 + i,
+        template_id=6852135057059610630,
+    )
+
+
+def build_lead(i: int) -> dict:
+    return dict(
+        request_id="202201010000000000",
+        lead_data={"name": "name", "email": "email@example.com"},
+        meta_data=dict(
+            lead_id=7000000000000000000 + i,
+            page_id=6854821673904898054,
+            campaign_id=1,
+            campaign_name="campaign",
+            adgroup_id=2,
+            adgroup_name="adgroup",
+            ad_id=3,
+            ad_name="ad",
+            create_time="2022-01-01 00:00:00",
+        ),
+    )
+
+
+def measure(payload: bytes, convert) -> int:
+    """This method returns the bytes held by the records decoded from payload."""
+    tracemalloc.start()
+    records = convert(json.loads(payload))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, build, record_class in [("pages", build_page, PageRecord), ("leads", build_lead, LeadRecord)]:
+        payload = json.dumps([build(i) for i in range(args.records)]).encode()
+        as_dicts = measure(payload, lambda items: items)
+        as_records = measure(payload, record_class.from_list)
+        print(
+            f"{name}: dict {as_dicts / args.records:.0f} B/record, "
+            f"{record_class.__name__} {as_records / args.records:.0f} B/record, "
+            f"x{as_dicts / as_records:.2f} smaller"
+        )
+
+    # nested records are only built on access
+    payload = json.dumps([build_lead(i) for i in range(args.records)]).encode()
+    as_dicts = measure(payload, lambda items: items)
+    as_records = measure(payload, lambda items: [record for record in LeadRecord.from_list(items) if record.meta_data])
+    print(
+        f"leads with meta_data accessed: dict {as_dicts / args.records:.0f} B/record, "
+        f"LeadRecord {as_records / args.records:.0f} B/record, x{as_dicts / as_records:.2f} smaller"
+    )
+
+
+if __name__ == "__main__":
+    main()
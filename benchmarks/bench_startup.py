@@ -0,0 +1,85 @@
+"""
+Cold start cost of the package: import time, building a TikTokClient and the first module access.
+Every sample runs in a new interpreter. With --max-import-ms the script exits with an error
+when the import is slower, or when modules that must be lazy were imported eagerly.
+
+    python benchmarks/bench_startup.py --repeat 20 --max-import-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# the probe imports the package of this checkout
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# must not be imported by `import tiktok_marketing`
+LAZY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "httpx",
+    "tiktok_marketing.async_client",
+    "tiktok_marketing.auth",
+    "tiktok_marketing.ad_account",
+    "tiktok_marketing.leads",
+    "tiktok_marketing.pages",
+    "tiktok_marketing.reporting",
+    "tiktok_marketing.user",
+    "tiktok_marketing.cache",
+    "sqlite3",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import tiktok_marketing
+imported = time.perf_counter()
+client = tiktok_marketing.TikTokClient("app_id", "secret")
+built = time.perf_counter()
+eager = [name for name in %r if name in sys.modules]
+client.leads
+accessed = time.perf_counter()
+print(json.dumps(dict(
+    import_ms=(imported - started) * 1000,
+    client_ms=(built - imported) * 1000,
+    first_module_ms=(accessed - built) * 1000,
+    eager=eager,
+)))
+""" % (LAZY_MODULES,)
+
+
+def sample() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-import-ms", type=float, help="fail when the median import time is higher")
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.repeat)]
+    results = {
+        metric: dict(
+            median=statistics.median(sample[metric] for sample in samples),
+            min=min(sample[metric] for sample in samples),
+        )
+        for metric in ("import_ms", "client_ms", "first_module_ms")
+    }
+    results["eager_modules"] = sorted({name for sample in samples for name in sample["eager"]})
+    print(json.dumps(results, indent=2))
+
+    if args.max_import_ms is not None:
+        if results["eager_modules"]:
+            sys.exit(f"modules imported at startup: {', '.join(results['eager_modules'])}")
+        if results["import_ms"]["median"] > args.max_import_ms:
+            sys.exit(f"import took {results['import_ms']['median']:.1f} ms, more than {args.max_import_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
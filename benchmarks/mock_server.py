@@ -0,0 +1,372 @@
+"""
+Local stand-in for the open_api/v1.2 endpoints used by AdAccount, Pages, Leads, Reporting, User and Auth.
+
+The server answers with the same envelope as TikTok, {"code", "message", "request_id", "data"},
+with configurable latency, page counts, payload sizes and injected 40100 and 50000 errors.
+
+    python benchmarks/mock_server.py --port 8000 --latency 0.05 --error-rate 0.01
+
+    with MockServer(MockConfig(total_pages=20)) as server:
+        client = TikTokClient(app_id, secret, access_token="token")
+        client.client.API_URL = server.url
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+API_PATH = "/open_api/v1.2/"
+
+
+class MockConfig:
+    """
+    ## Parameters
+    - latency: float, seconds added to every response.
+    - jitter: float, up to this many seconds are added at random to the latency.
+    - total_pages: int, pages of every paginated endpoint.
+    - page_size: int, records per page when the request doesn't set page_size.
+    - payload_size: int, bytes of padding added to every record.
+    - error_rate: float, share of requests answered with code 50000.
+    - throttle_rate: float, share of requests answered with code 40100.
+    - lead_rows: int, rows of the CSV served by pages/leads/task/download/.
+    - task_polls: int, polls before a lead download task succeeds.
+    - seed: int, seed of the injected errors and jitter.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        total_pages: int = 10,
+        page_size: int = 100,
+        payload_size: int = 0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        lead_rows: int = 10000,
+        task_polls: int = 1,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.total_pages = total_pages
+        self.page_size = page_size
+        self.payload_size = payload_size
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.lead_rows = lead_rows
+        self.task_polls = task_polls
+        self.seed = seed
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, Nagle's algorithm would delay the body
+    disable_nagle_algorithm = True
+    server: "MockHTTPServer"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            params.update(json.loads(self.rfile.read(length)))
+
+        endpoint = url.path[len(API_PATH) :] if url.path.startswith(API_PATH) else url.path
+        mock = self.server.mock
+        mock.calls[endpoint] += 1
+        delay, error = mock.draw()
+        if delay:
+            time.sleep(delay)
+
+        if error is not None:
+            return self.send_json(dict(code=error, message="injected error", request_id=mock.request_id()))
+
+        route = ROUTES.get(endpoint)
+        if route is None:
+            return self.send_json(dict(code=40002, message=f"unknown endpoint {endpoint}"), status=404)
+
+        result = route(mock, params, self)
+        if result is not None:
+            self.send_json(dict(code=0, message="OK", request_id=mock.request_id(), data=result))
+
+    do_POST = do_GET
+
+    def send_json(self, body: dict, status: int = 200) -> None:
+        self.send_body(json.dumps(body).encode(), "application/json", status)
+
+    def send_body(self, content: bytes, content_type: str, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockServer"
+
+
+def get_page(config: MockConfig, params: dict) -> tuple:
+    page = int(params.get("page", 1))
+    page_size = int(params.get("page_size", config.page_size))
+    page_info = dict(
+        page=page,
+        page_size=page_size,
+        total_number=config.total_pages * page_size,
+        total_page=config.total_pages,
+    )
+    if page > config.total_pages:
+        return page_info, range(0)
+    start = (page - 1) * page_size
+    return page_info, range(start, start + page_size)
+
+
+def padding(config: MockConfig) -> dict:
+    return dict(padding="x" * config.payload_size) if config.payload_size else {}
+
+
+def build_page(i: int, config: MockConfig) -> dict:
+    return dict(
+        page_id=6854821673904898054 + i,
+        status="PUBLISHED",
+        title=f"page {i}",
+        duplicate_id=6854791294359699461,
+        user_id=6844401689412666374,
+        preview_url="http://preview.page.url",
+        thumbnail="http://preview.page.thumbnail",
+        create_time=1596012542,
+        update_time=1597055449 + i,
+        publish_time=1597055450,
+        template_id=6852135057059610630,
+        **padding(config),
+    )
+
+
+def build_subscription(i: int, config: MockConfig) -> dict:
+    return dict(
+        subscription_id=str(7000000000000000000 + i),
+        object="LEAD",
+        url="https://example.com/webhook",
+        subscription_detail=dict(advertiser_id="1", library_id="2", page_id=str(6854821673904898054 + i)),
+        **padding(config),
+    )
+
+
+def pages_get(mock, params, handler) -> dict:
+    page_info, indexes = get_page(mock.config, params)
+    return dict(page_info=page_info, list=[build_page(i, mock.config) for i in indexes])
+
+
+def subscription_get(mock, params, handler) -> dict:
+    page_info, indexes = get_page(mock.config, params)
+    return dict(page_info=page_info, subscriptions=[build_subscription(i, mock.config) for i in indexes])
+
+
+def report(mock, params, handler) -> dict:
+    page_info, indexes = get_page(mock.config, params)
+    dimensions = json.loads(params.get("dimensions", "[]"))
+    start_date = params.get("start_date", "lifetime")
+    rows = []
+    for i in indexes:
+        row_dimensions = {dimension: str(i) for dimension in dimensions}
+        if "stat_time_day" in row_dimensions:
+            row_dimensions["stat_time_day"] = f"{start_date} 00:00:00"
+        row_metrics = {metric: str(i * 1.5) for metric in json.loads(params.get("metrics", "[]"))}
+        rows.append(dict(dimensions=row_dimensions, metrics=row_metrics, **padding(mock.config)))
+    return dict(page_info=page_info, list=rows)
+
+
+def advertiser_info(mock, params, handler) -> list:
+    advertiser_ids = params.get("advertiser_ids", "[]")
+    if isinstance(advertiser_ids, str):
+        advertiser_ids = json.loads(advertiser_ids)
+    return [
+        dict(advertiser_id=advertiser_id, name=f"advertiser {advertiser_id}", currency="USD", **padding(mock.config))
+        for advertiser_id in advertiser_ids
+    ]
+
+
+def advertiser_get(mock, params, handler) -> dict:
+    return dict(list=[dict(advertiser_id=str(i), advertiser_name=f"advertiser {i}") for i in range(10)])
+
+
+def user_info(mock, params, handler) -> dict:
+    return dict(id="6844401689412666374", display_name="user", email="user@example.com", create_time=1596012542)
+
+
+def access_token(mock, params, handler) -> dict:
+    return dict(access_token="mock-token", advertiser_ids=["1"], scope=[1, 2, 3])
+
+
+def create_test_lead(mock, params, handler) -> dict:
+    lead_id = mock.next_id()
+    meta_data = dict(lead_id=str(lead_id), page_id=params.get("page_id"), create_time="2022-01-01 00:00:00")
+    return dict(lead_data={"name": "name", "email": "email@example.com"}, meta_data=meta_data)
+
+
+def empty(mock, params, handler) -> dict:
+    return {}
+
+
+def subscribe(mock, params, handler) -> dict:
+    return dict(subscription_id=str(mock.next_id()))
+
+
+def library_get(mock, params, handler) -> dict:
+    return dict(libraries=[dict(library_id=str(i), name=f"library {i}") for i in range(3)])
+
+
+def lead_task(mock, params, handler) -> dict:
+    task_id = params.get("task_id") or str(mock.next_id())
+    polls = mock.poll(task_id)
+    status = "SUCCEED" if polls > mock.config.task_polls else "RUNNING"
+    return dict(task_id=task_id, status=status)
+
+
+def lead_download(mock, params, handler):
+    content = mock.lead_csv()
+    status = 200
+    content_range = handler.headers.get("Range")
+    if content_range:
+        offset = int(content_range.split("=")[1].rstrip("-"))
+        content = content[offset:]
+        status = 206 if content else 416
+    handler.send_body(content, "text/csv", status)
+
+
+ROUTES = {
+    "oauth2/access_token/": access_token,
+    "oauth2/advertiser/get/": advertiser_get,
+    "advertiser/info/": advertiser_info,
+    "user/info/": user_info,
+    "pages/get/": pages_get,
+    "reports/integrated/get/": report,
+    "pages/leads/mock/create/": create_test_lead,
+    "pages/leads/mock/delete/": empty,
+    "pages/leads/task/": lead_task,
+    "pages/leads/task/download/": lead_download,
+    "pages/library/get/": library_get,
+    "pages/library/transfer/": empty,
+    "subscription/subscribe/": subscribe,
+    "subscription/get/": subscription_get,
+    "subscription/unsubscribe/": empty,
+}
+
+
+class MockServer:
+    """
+    Mock API server running in a background thread, `url` is the API_URL to give to a client.
+    `calls` counts the requests per endpoint.
+    """
+
+    def __init__(self, config: MockConfig = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockConfig()
+        self.calls = Counter()
+        self.random = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.tasks = Counter()
+        self.ids = 0
+        self._lead_csv = None
+        self.httpd = MockHTTPServer((host, port), MockHandler)
+        self.httpd.mock = self
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def start(self) -> "MockServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def draw(self) -> tuple:
+        """This method returns the delay and the injected error code, if any, of a request."""
+        config = self.config
+        with self.lock:
+            delay = config.latency + (self.random.uniform(0, config.jitter) if config.jitter else 0.0)
+            roll = self.random.random()
+        if roll < config.throttle_rate:
+            return delay, 40100
+        if roll < config.throttle_rate + config.error_rate:
+            return delay, 50000
+        return delay, None
+
+    def next_id(self) -> int:
+        with self.lock:
+            self.ids += 1
+            return 7100000000000000000 + self.ids
+
+    def request_id(self) -> str:
+        with self.lock:
+            suffix = self.random.getrandbits(32)
+        return f"{time.strftime('%Y%m%d%H%M%S')}{suffix:010d}"
+
+    def poll(self, task_id: str) -> int:
+        with self.lock:
+            self.tasks[task_id] += 1
+            return self.tasks[task_id]
+
+    def lead_csv(self) -> bytes:
+        if self._lead_csv is None:
+            rows = (f"{7000000000000000000 + i},name {i},user{i}@example.com\n" for i in range(self.config.lead_rows))
+            self._lead_csv = ("lead_id,name,email\n" + "".join(rows)).encode()
+        return self._lead_csv
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--total-pages", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--payload-size", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        total_pages=args.total_pages,
+        page_size=args.page_size,
+        payload_size=args.payload_size,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    server = MockServer(config, args.host, args.port)
+    print(f"Serving the mock API on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
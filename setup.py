@@ -18,5 +18,6 @@ setup(
     license="MIT",
     packages=["tiktok_marketing"],
     install_requires=["requests"],
+    extras_require={"async": ["httpx"], "fast": ["orjson"], "columnar": ["numpy"]},
     zip_safe=False,
 )
@@ -0,0 +1,71 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from tiktok_marketing import TikTokClient
+
+
+class EchoTokenHandler(BaseHTTPRequestHandler):
+    """Answers every call with the Access-Token header it received."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        token = self.headers.get("Access-Token")
+        self.server.tokens.append(token)
+        body = json.dumps(dict(code=0, message="OK", data=dict(access_token=token))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SharedClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoTokenHandler)
+        self.server.daemon_threads = True
+        self.server.tokens = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = TikTokClient("app_id", "secret", access_token="shared", pool_maxsize=16)
+        self.client.client.API_URL = f"http://127.0.0.1:{self.server.server_port}/"
+        self.tokens = [f"token-{index}" for index in range(200)]
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_with_token_from_many_threads(self):
+        def call(token):
+            return self.client.with_token(token).user.info()["access_token"]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            echoed = list(executor.map(call, self.tokens))
+
+        self.assertEqual(echoed, self.tokens)
+        self.assertEqual(sorted(self.server.tokens), sorted(self.tokens))
+        self.assertEqual(self.client.client.access_token, "shared")
+
+    def test_per_call_token_from_many_threads(self):
+        url = self.client.client.build_url("user/info/")
+
+        def call(token):
+            return self.client.client.get(url, access_token=token)["access_token"]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            echoed = list(executor.map(call, self.tokens))
+
+        self.assertEqual(echoed, self.tokens)
+        self.assertEqual(sorted(self.server.tokens), sorted(self.tokens))
+        self.assertEqual(self.client.user.info()["access_token"], "shared")
+
+
+if __name__ == "__main__":
+    unittest.main()
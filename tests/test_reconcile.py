@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+
+from benchmarks import mock_server
+from benchmarks.mock_server import MockServer
+from tiktok_marketing import TikTokClient
+
+URL = "https://example.com/webhook"
+OTHER_URL = "https://example.com/other"
+
+
+def build_subscription(subscription_id, url, page_id, advertiser_id="1"):
+    detail = dict(advertiser_id=advertiser_id, page_id=str(page_id))
+    return dict(subscription_id=str(subscription_id), object="LEAD", url=url, subscription_detail=detail)
+
+
+class ReconcileSubscriptionsTest(unittest.TestCase):
+    """The mock server answers subscription/get/ with `self.existing`."""
+
+    def setUp(self):
+        self.existing = [
+            build_subscription(1, URL, 10),
+            build_subscription(2, URL, 11),
+            build_subscription(3, URL, 11),
+            build_subscription(4, OTHER_URL, 12),
+        ]
+        routes = mock.patch.dict(mock_server.ROUTES, {"subscription/get/": self.subscription_get})
+        routes.start()
+        self.addCleanup(routes.stop)
+        self.server = MockServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = TikTokClient("app_id", "secret", access_token="token")
+        self.client.client.API_URL = self.server.url
+        self.addCleanup(self.client.close)
+
+    def subscription_get(self, server, params, handler):
+        page, page_size = int(params["page"]), int(params["page_size"])
+        total_page = -(-len(self.existing) // page_size)
+        subscriptions = self.existing[(page - 1) * page_size : page * page_size]
+        return dict(subscriptions=subscriptions, page_info=dict(page=page, page_size=page_size, total_page=total_page))
+
+    def reconcile(self, desired, **kwargs):
+        return self.client.leads.reconcile_subscriptions(desired, page_size=2, **kwargs)
+
+    def writes(self) -> tuple:
+        return self.server.calls["subscription/subscribe/"], self.server.calls["subscription/unsubscribe/"]
+
+    def test_creates_and_cancels(self):
+        report = self.reconcile([(URL, 11, 1, None), (URL, 13, 1, None)])
+
+        self.assertEqual(report.creates, [dict(callback_url=URL, page_id=13, advertiser_id=1, library_id=None)])
+        self.assertEqual([item["subscription_id"] for item in report.cancels], ["1", "3"])
+        self.assertEqual(report.unchanged, 1)
+        self.assertTrue(report.ok)
+        self.assertEqual((len(report.created.succeeded), len(report.cancelled.succeeded)), (1, 2))
+        self.assertEqual(self.writes(), (1, 2))
+
+    def test_duplicates_are_cancelled(self):
+        report = self.reconcile([(URL, 10, 1, None), (URL, 11, 1, None), (URL, 11, "1", None)])
+
+        self.assertEqual(report.creates, [])
+        self.assertEqual([item["subscription_id"] for item in report.cancels], ["3"])
+        self.assertEqual(report.unchanged, 2)
+
+    def test_managed_urls(self):
+        report = self.reconcile([(URL, 10, 1, None)], managed_urls=[OTHER_URL])
+        self.assertEqual([item["subscription_id"] for item in report.cancels], ["4"])
+
+        report = self.reconcile([(URL, 10, 1, None)], managed_urls=[URL, OTHER_URL])
+        self.assertEqual([item["subscription_id"] for item in report.cancels], ["2", "3", "4"])
+
+    def test_dry_run_makes_no_write_calls(self):
+        report = self.reconcile([(URL, 13, 1, None)], dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(len(report.creates), 1)
+        self.assertEqual(len(report.cancels), 3)
+        self.assertEqual(self.writes(), (0, 0))
+        self.assertEqual(self.server.calls["subscription/get/"], 2)
+
+    def test_desired_without_owner(self):
+        with self.assertRaises(ValueError):
+            self.reconcile([(URL, 13, None, None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
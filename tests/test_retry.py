@@ -0,0 +1,60 @@
+import unittest
+
+from benchmarks.mock_server import MockConfig
+from benchmarks.mock_server import MockServer
+from tiktok_marketing import TikTokClient
+from tiktok_marketing.exceptions import SystemError
+from tiktok_marketing.exceptions import TooManyRequestsError
+from tiktok_marketing.retry import RetryBudget
+from tiktok_marketing.retry import RetryPolicy
+
+
+class RetryTest(unittest.TestCase):
+    def start(self, budget=None, **config):
+        self.server = MockServer(MockConfig(**config)).start()
+        self.addCleanup(self.server.stop)
+        policy = RetryPolicy(max_retries=2, backoff_factor=0, budget=budget)
+        self.client = TikTokClient("app_id", "secret", access_token="token", retry_policy=policy).client
+        self.client.API_URL = self.server.url
+        self.addCleanup(self.client.close)
+
+    def test_retryable_code_is_retried(self):
+        self.start(error_rate=1.0)
+        with self.assertRaises(SystemError) as raised:
+            self.client.get(self.client.build_url("user/info/"))
+
+        self.assertEqual(self.server.calls["user/info/"], 3)
+        attempts = raised.exception.attempts
+        self.assertEqual([attempt["attempt"] for attempt in attempts], [1, 2, 3])
+        self.assertTrue(all(isinstance(attempt["error"], SystemError) for attempt in attempts))
+        self.assertEqual([attempt["backoff"] is None for attempt in attempts], [False, False, True])
+
+    def test_post_is_not_replayed_on_system_error(self):
+        self.start(error_rate=1.0)
+        with self.assertRaises(SystemError) as raised:
+            self.client.post(self.client.build_url("subscription/subscribe/"), json=dict(object="LEAD"))
+
+        self.assertEqual(self.server.calls["subscription/subscribe/"], 1)
+        self.assertEqual(len(raised.exception.attempts), 1)
+
+    def test_post_is_retried_when_throttled(self):
+        self.start(throttle_rate=1.0)
+        with self.assertRaises(TooManyRequestsError) as raised:
+            self.client.post(self.client.build_url("subscription/subscribe/"), json=dict(object="LEAD"))
+
+        self.assertEqual(self.server.calls["subscription/subscribe/"], 3)
+        self.assertEqual(len(raised.exception.attempts), 3)
+
+    def test_retries_stop_when_budget_is_exhausted(self):
+        self.start(budget=RetryBudget(ratio=0, min_per_second=0, max_tokens=3), error_rate=1.0)
+        url = self.client.build_url("user/info/")
+        for _ in range(3):
+            with self.assertRaises(SystemError):
+                self.client.get(url)
+
+        # 2 retries for the first call, the last token for the second one, none for the third
+        self.assertEqual(self.server.calls["user/info/"], 3 + 2 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
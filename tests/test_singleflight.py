@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+
+from tiktok_marketing.singleflight import SingleFlight
+
+
+class SingleFlightAsyncTest(unittest.TestCase):
+    def test_leader_cancelled_waiter_gets_result(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"list": [1, 2]}
+
+        async def run():
+            flight = SingleFlight()
+            leader = asyncio.ensure_future(flight.do_async("key", fetch))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(flight.do_async("key", fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            result = await waiter
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return result, flight
+
+        result, flight = asyncio.run(run())
+        self.assertEqual(result, {"list": [1, 2]})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.async_calls, {})
+
+    def test_waiters_get_copies_of_the_result(self):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return {"list": [1]}
+
+        async def run():
+            flight = SingleFlight()
+            return await asyncio.gather(*(flight.do_async("key", fetch) for _ in range(3)))
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [{"list": [1]}] * 3)
+        self.assertIsNot(results[0], results[1])
+
+    def test_error_is_shared(self):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        async def run():
+            flight = SingleFlight()
+            return await asyncio.gather(*(flight.do_async("key", fetch) for _ in range(2)), return_exceptions=True)
+
+        errors = asyncio.run(run())
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from tiktok_marketing import TikTokClient
+from tiktok_marketing.store import EntityStore
+
+
+def build_page(page_id, update_time, title="form"):
+    return dict(page_id=str(page_id), status="PUBLISHED", title=title, update_time=update_time)
+
+
+class ChangedPagesTest(unittest.TestCase):
+    """The API is replaced by `get_pages`, which filters `self.remote` on update_time like the API."""
+
+    def setUp(self):
+        self.client = TikTokClient("app_id", "secret", access_token="token")
+        self.client.pages.get_pages = self.get_pages
+        self.store = EntityStore()
+        self.remote = [build_page(index, 1000 + index) for index in range(1, 6)]
+        self.starts = []
+        self.page_size = 2
+        self.extra = {}
+
+    def tearDown(self):
+        self.store.close()
+        self.client.close()
+
+    def get_pages(self, advertiser_id=None, library_id=None, page=1, start=None, end=None, **kwargs):
+        self.starts.append(start)
+        pages = [item for item in self.remote if start is None or item["update_time"] >= start]
+        total_page = -(-len(pages) // self.page_size)
+        pages = pages[(page - 1) * self.page_size : page * self.page_size] + self.extra.get(page, [])
+        return dict(list=pages, page_info=dict(page=page, page_size=self.page_size, total_page=total_page))
+
+    def sync(self, **kwargs):
+        return list(self.client.pages.iter_changed_pages(self.store, advertiser_id=1, end=2000, **kwargs))
+
+    def test_first_sync_yields_everything(self):
+        self.assertEqual(self.sync(), self.remote)
+        self.assertEqual(self.store.count("pages"), 5)
+        self.assertEqual(self.store.get_watermark("pages:advertiser_id=1"), 2000)
+
+    def test_second_sync_yields_changed_pages(self):
+        self.sync()
+        self.remote[1] = build_page(2, 1990, title="renamed")
+        self.remote.append(build_page(6, 1995))
+
+        self.assertEqual(self.sync(overlap=100), [self.remote[1], self.remote[5]])
+        self.assertEqual(self.starts[-1], 1900)
+        self.assertEqual(self.store.get("pages", "2")["title"], "renamed")
+
+    def test_overlap_doesnt_yield_unchanged_pages(self):
+        self.remote = [build_page(index, 1950 + index) for index in range(1, 6)]
+        self.sync()
+
+        self.assertEqual(self.sync(overlap=100), [])
+        self.assertEqual(self.starts[-1], 1900)
+
+    def test_page_seen_twice_is_yielded_once(self):
+        # forms shifting to a later API page while the sync paginates, the first one after it was staged
+        self.remote = [build_page(index, 1000 + index) for index in range(1, 1001)]
+        self.page_size = 250
+        self.extra = {3: [self.remote[0]], 4: [self.remote[999]]}
+
+        self.assertEqual(self.sync(), self.remote)
+        self.assertEqual(self.store.count("pages"), 1000)
+
+    def test_early_stop_writes_nothing(self):
+        pages = self.client.pages.iter_changed_pages(self.store, advertiser_id=1, end=2000)
+        next(pages)
+        pages.close()
+
+        self.assertEqual(self.store.count("pages"), 0)
+        self.assertIsNone(self.store.get_watermark("pages:advertiser_id=1"))
+
+    def test_exception_writes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            for _ in self.client.pages.iter_changed_pages(self.store, advertiser_id=1, end=2000):
+                raise RuntimeError("consumer failed")
+
+        self.assertEqual(self.store.count("pages"), 0)
+        self.assertIsNone(self.store.get_watermark("pages:advertiser_id=1"))
+        self.assertEqual(self.sync(), self.remote)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+import unittest
+from wsgiref.simple_server import make_server
+
+import requests
+
+from tiktok_marketing.webhook import AsyncLeadWebhook
+from tiktok_marketing.webhook import LeadWebhook
+from tiktok_marketing.webhook import QuietWSGIRequestHandler
+from tiktok_marketing.webhook import ThreadingWSGIServer
+
+
+def build_callback(*lead_ids) -> bytes:
+    return json.dumps({"entry": [{"lead_id": lead_id} for lead_id in lead_ids]}).encode()
+
+
+class LeadWebhookTest(unittest.TestCase):
+    def setUp(self):
+        self.seen = []
+        self.release = threading.Event()
+
+        def handle(lead):
+            self.release.wait(5)
+            self.seen.append(lead["lead_id"])
+
+        self.webhook = LeadWebhook(handle, workers=1, max_queue=2)
+        self.server = make_server(
+            "127.0.0.1",
+            0,
+            self.webhook,
+            server_class=ThreadingWSGIServer,
+            handler_class=QuietWSGIRequestHandler,
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def tearDown(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.webhook.stop(timeout=5)
+
+    def test_callback_is_queued(self):
+        self.release.set()
+        response = requests.post(self.url, data=build_callback(1, 2))
+        self.assertEqual(response.status_code, 200)
+        self.webhook.queue.join()
+        self.assertEqual(sorted(self.seen), [1, 2])
+
+    def test_invalid_callback(self):
+        response = requests.post(self.url, data=b"not json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.webhook.stats()["invalid"], 1)
+
+    def test_callback_without_room_is_not_queued(self):
+        response = requests.post(self.url, data=build_callback(1, 2, 3, 4))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertEqual(self.webhook.queue_depth(), 0)
+
+        self.assertEqual(requests.post(self.url, data=build_callback(1)).status_code, 200)
+        # the worker holds lead 1, the queue has room for one more lead
+        self.assertEqual(requests.post(self.url, data=build_callback(2, 3, 4)).status_code, 503)
+        self.release.set()
+        self.webhook.queue.join()
+        self.assertEqual(self.seen, [1])
+
+        stats = requests.get(self.url + "stats").json()
+        self.assertEqual(stats["accepted"], 1)
+        self.assertEqual(stats["rejected"], 7)
+
+
+class AsyncLeadWebhookTest(unittest.TestCase):
+    def test_callback_is_queued_whole_or_not_at_all(self):
+        seen = []
+
+        async def handle(lead):
+            seen.append(lead["lead_id"])
+
+        async def run():
+            webhook = AsyncLeadWebhook(handle, consumers=1, max_queue=2)
+            statuses = []
+            for body in (build_callback(1, 2, 3, 4), build_callback(1, 2), build_callback(3)):
+                statuses.append(await self.call(webhook, body))
+            await webhook.stop()
+            return statuses
+
+        self.assertEqual(asyncio.run(run()), [503, 200, 503])
+        self.assertEqual(seen, [1, 2])
+
+    async def call(self, webhook, body: bytes) -> int:
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await webhook({"type": "http", "method": "POST", "path": "/"}, receive, send)
+        return sent[0]["status"]
+
+
+if __name__ == "__main__":
+    unittest.main()
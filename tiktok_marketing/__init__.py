@@ -1 +1,7 @@
+import logging
+
 from tiktok_marketing.api import TikTokClient
+from tiktok_marketing.api import AsyncTikTokClient
+
+# applications configure logging, without a handler nothing is printed
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -1,8 +1,13 @@
-from xml.etree.ElementInclude import include
+from tiktok_marketing.batch import BatchResult
+from tiktok_marketing.batch import amap_concurrently
+from tiktok_marketing.batch import map_concurrently
 from tiktok_marketing.module import Module
+from tiktok_marketing.pagination import get_items
 
 
 class AdAccount(Module):
+    ADVERTISER_INFO_CHUNK_SIZE = 100
+
     def get_advertisers(self) -> dict:
         """
         This method returns a list of advertiser accounts that authorized an app
@@ -28,10 +33,18 @@ class AdAccount(Module):
         params = self.client.build_app_data(include_access_token=True)
         return self.client.get(endpoint, params=params)
 
-    def get_advertiser_info(self, advertiser_ids: list, fields: list = None) -> list:
+    def get_advertiser_info(
+        self,
+        advertiser_ids: list,
+        fields: list = None,
+        chunk_size: int = ADVERTISER_INFO_CHUNK_SIZE,
+        max_workers: int = 4,
+    ) -> list:
         """
         This method returns the details of an advertiser's account.
         To minimize the number of API calls, a list of advertiser ids can be provided.
+        Duplicated ids are removed and long lists are split in chunks of `chunk_size` ids
+        that are fetched concurrently.
 
         ## Reference
 
@@ -64,10 +77,54 @@ class AdAccount(Module):
                 - country
                 - balance
                 - create_time
+        - chunk_size: int, optional, default: 100
+            - maximum number of advertiser ids sent in a single call.
+        - max_workers: int, optional, default: 4
+            - maximum number of chunks fetched at the same time.
+
+        ## Returns
+        - BatchResult, a list with the advertisers info in the order of advertiser_ids.
+            - `errors`: dict of tuple of advertiser ids -> exception for the chunks that failed,
+            the advertisers of the other chunks are kept.
 
+        If every chunk fails, e.g. with an invalid access token, the error of the first chunk is raised.
+        With AsyncClient an awaitable is returned.
         """
-        endpoint = self.client.build_url("advertiser/info/")
-        params = dict(advertiser_ids=advertiser_ids)
-        if fields is not None:
-            params.update(fields=fields)
-        return self.client.get(endpoint, params=params)
+        advertiser_ids = list(dict.fromkeys(advertiser_ids))
+        chunks = [advertiser_ids[i : i + chunk_size] for i in range(0, len(advertiser_ids), chunk_size)]
+
+        def fetch_chunk(chunk):
+            endpoint = self.client.build_url("advertiser/info/")
+            params = dict(advertiser_ids=chunk)
+            if fields is not None:
+                params.update(fields=fields)
+            return self.client.get(endpoint, params=params)
+
+        if self.client.is_async:
+            return self._aget_advertiser_info(fetch_chunk, advertiser_ids, chunks, max_workers)
+
+        results, errors = map_concurrently(fetch_chunk, chunks, max_workers=max_workers)
+        return self._merge_advertiser_info(advertiser_ids, chunks, results, errors)
+
+    async def _aget_advertiser_info(self, fetch_chunk, advertiser_ids, chunks, max_workers) -> BatchResult:
+        results, errors = await amap_concurrently(fetch_chunk, chunks, max_workers=max_workers)
+        return self._merge_advertiser_info(advertiser_ids, chunks, results, errors)
+
+    def _merge_advertiser_info(self, advertiser_ids, chunks, results, errors) -> BatchResult:
+        if chunks and len(errors) == len(chunks):
+            raise errors[0]
+
+        merged = BatchResult()
+        for data in results:
+            if data is not None:
+                merged.extend(data if isinstance(data, list) else get_items(data))
+
+        position = {str(advertiser_id): index for index, advertiser_id in enumerate(advertiser_ids)}
+
+        def sort_key(advertiser):
+            advertiser_id = advertiser.get("id", advertiser.get("advertiser_id"))
+            return position.get(str(advertiser_id), len(position))
+
+        merged.sort(key=sort_key)
+        merged.errors = {tuple(chunks[index]): error for index, error in errors.items()}
+        return merged
@@ -1,55 +1,162 @@
+import importlib
+
 from tiktok_marketing.client import Client
-from tiktok_marketing.auth import Auth
-from tiktok_marketing.ad_account import AdAccount
-from tiktok_marketing.leads import Leads
-from tiktok_marketing.pages import Pages
-from tiktok_marketing.user import User
+
+
+def import_string(path: str):
+    """This method imports an object from a "package.module:name" path."""
+    module_name, _, name = path.partition(":")
+    return getattr(importlib.import_module(module_name), name)
+
+
+class LazyModule:
+    """
+    API module of the facade, imported and built with the facade client on first access.
+    The module is then stored on the facade so later accesses are plain attribute lookups.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.name = None
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, facade, owner=None):
+        if facade is None:
+            return self
+        module = import_string(self.path)(facade.client)
+        facade.__dict__[self.name] = module
+        return module
+
+
+class LazyClass:
+    """Class attribute that imports its class on access, e.g. to avoid importing httpx at startup."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __get__(self, instance, owner=None) -> type:
+        return import_string(self.path)
 
 
 class TikTokClient:
     """
     Facade to provide access to different API modules
 
+    Modules are imported on first access, e.g. `client.leads`, so importing the package stays fast
+    however many modules there are.
+
     Modules reference: https://ads.tiktok.com/marketing_api/docs?id=1705600933769218
     """
 
+    client_class = Client
+
+    auth = LazyModule("tiktok_marketing.auth:Auth")
+    ad_account = LazyModule("tiktok_marketing.ad_account:AdAccount")
+    leads = LazyModule("tiktok_marketing.leads:Leads")
+    pages = LazyModule("tiktok_marketing.pages:Pages")
+    reporting = LazyModule("tiktok_marketing.reporting:Reporting")
+    user = LazyModule("tiktok_marketing.user:User")
+    # TODO: Ads
+    # TODO: Ad Comments
+    # TODO: Ad Groups
+    # TODO: Audiences
+    # TODO: Automated Rules
+    # TODO: Business Center
+    # TODO: BC Partners
+    # TODO: BC Members
+    # TODO: Campaigns
+    # TODO: Catalogs
+    # TODO: Catalog Event Source
+    # TODO: Catalog Feeds
+    # TODO: Catalog Products
+    # TODO: Catalog Product Sets
+    # TODO: Catalog Videos
+    # TODO: Change Log
+    # TODO: Creative Portfolios
+    # TODO: Events API
+    # TODO: Files
+    # TODO: Identity
+    # TODO: Images
+    # TODO: Mobile Apps
+    # TODO: Music
+    # TODO: Pangle
+    # TODO: Pixels
+    # TODO: Reach and Frequency
+    # TODO: Spark Ads
+    # TODO: Split Test
+    # TODO: Terms
+    # TODO: TikTok Store
+    # TODO: Tools
+    # TODO: Videos
+
     def __init__(self, app_id: str, secret: str, **kwargs) -> None:
-        client = Client(app_id=app_id, secret=secret, **kwargs)
-        self.auth = Auth(client)
-        self.ad_account = AdAccount(client)
-        self.leads = Leads(client)
-        self.pages = Pages(client)
-        self.user = User(client)
-        # TODO: Ads
-        # TODO: Ad Comments
-        # TODO: Ad Groups
-        # TODO: Audiences
-        # TODO: Automated Rules
-        # TODO: Business Center
-        # TODO: BC Partners
-        # TODO: BC Members
-        # TODO: Campaigns
-        # TODO: Catalogs
-        # TODO: Catalog Event Source
-        # TODO: Catalog Feeds
-        # TODO: Catalog Products
-        # TODO: Catalog Product Sets
-        # TODO: Catalog Videos
-        # TODO: Change Log
-        # TODO: Creative Portfolios
-        # TODO: Events API
-        # TODO: Files
-        # TODO: Identity
-        # TODO: Images
-        # TODO: Mobile Apps
-        # TODO: Music
-        # TODO: Pangle
-        # TODO: Pixels
-        # TODO: Reach and Frequency
-        # TODO: Reporting
-        # TODO: Spark Ads
-        # TODO: Split Test
-        # TODO: Terms
-        # TODO: TikTok Store
-        # TODO: Tools
-        # TODO: Videos
+        """
+        Keyword arguments are passed to `Client`, e.g. `session`, `pool_maxsize`.
+        Use `close()` or a `with` block to release the pooled connections.
+        """
+        client = self.client_class(app_id=app_id, secret=secret, **kwargs)
+        self.init_modules(client)
+
+    @classmethod
+    def from_client(cls, client: Client) -> "TikTokClient":
+        """This method returns a facade for an existing client."""
+        facade = cls.__new__(cls)
+        facade.init_modules(client)
+        return facade
+
+    def with_token(self, access_token: str) -> "TikTokClient":
+        """
+        This method returns a facade bound to another access token, see `Client.with_token`.
+        Use it instead of `auth.set_access_token` when the facade is shared by many threads or tasks.
+        """
+        return self.from_client(self.client.with_token(access_token))
+
+    def with_timeout(self, timeout) -> "TikTokClient":
+        """This method returns a facade whose requests use another default timeout, see `Client.with_timeout`."""
+        return self.from_client(self.client.with_timeout(timeout))
+
+    def init_modules(self, client: Client) -> None:
+        """
+        This method binds the facade to a client, modules are built on first access.
+        New modules are added as `LazyModule` class attributes.
+        """
+        self.client = client
+
+    def close(self):
+        """This method releases the connections held by the underlying client."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class AsyncTikTokClient(TikTokClient):
+    """
+    Facade to provide access to different API modules using asyncio.
+
+    Module methods that call the API return awaitables:
+
+        async with AsyncTikTokClient(app_id, secret) as client:
+            client.auth.set_access_token(access_token)
+            user = await client.user.info()
+    """
+
+    client_class = LazyClass("tiktok_marketing.async_client:AsyncClient")
+
+    async def close(self):
+        """This method releases the connections held by the underlying client."""
+        await self.client.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with AsyncTikTokClient.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,387 @@
+import asyncio
+import time
+from tiktok_marketing.client import Client
+from tiktok_marketing.deadline import cap_delay
+from tiktok_marketing.deadline import check_deadline
+from tiktok_marketing.deadline import get_timeout
+from tiktok_marketing.download import awrite_chunks
+from tiktok_marketing.download import get_position
+from tiktok_marketing.download import get_resume_offset
+from tiktok_marketing.download import is_path
+from tiktok_marketing.download import rewind
+from tiktok_marketing.exceptions import TooManyRequestsError
+from tiktok_marketing.instrumentation import emit
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncClient(Client):
+    """
+    httpx wrapper to perform asynchronous calls to tiktok marketing api.
+
+    It shares build_url, build_app_data and parse_response with `Client`,
+    get, post, put, delete and request are coroutines.
+    """
+
+    is_async = True
+    transport_errors = (httpx.TransportError,) if httpx is not None else ()
+    timeout_errors = (httpx.TimeoutException,) if httpx is not None else ()
+
+    def __init__(
+        self,
+        app_id: str = None,
+        secret: str = None,
+        access_token: str = None,
+        sandbox: bool = False,
+        session: "httpx.AsyncClient" = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        **kwargs,
+    ):
+        """
+        Initialize required parameters for API access.
+
+        ## Parameters
+        - session: httpx.AsyncClient, optional
+            - A session to share between several clients, see `create_session`.
+            The client will not close a session it did not create.
+        - max_connections: int, optional, default: 100
+            - Maximum number of concurrent connections.
+        - max_keepalive_connections: int, optional, default: 20
+            - Maximum number of idle connections kept alive.
+        - keepalive_expiry: float, optional, default: 5.0
+            - Seconds an idle connection is kept alive.
+
+        Other keyword arguments are the same as `Client`, e.g. `rate_limiter`.
+        """
+        owns_session = session is None
+        if session is None:
+            session = self.create_session(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+
+        super().__init__(app_id, secret, access_token, sandbox, session=session, **kwargs)
+        self._owns_session = owns_session
+
+    @staticmethod
+    def create_session(
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+    ) -> "httpx.AsyncClient":
+        """
+        This method returns an httpx.AsyncClient with a keep-alive connection pool.
+        The session can be passed to several clients to share the same pool.
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncClient, install it with: pip install httpx")
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        return httpx.AsyncClient(limits=limits, follow_redirects=True)
+
+    async def close(self):
+        """This method releases the pooled connections if the session is owned by the client."""
+        if self._owns_session:
+            await self.session.aclose()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with AsyncClient.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("get", url, **kwargs)
+
+    async def post(self, url: str, json: dict, **kwargs):
+        return await self.request("post", url, json=json, **kwargs)
+
+    async def put(self, url: str, json: dict, **kwargs):
+        return await self.request("put", url, json=json, **kwargs)
+
+    async def delete(self, url: str, **kwargs):
+        return await self.request("delete", url, **kwargs)
+
+    async def request(self, method, url, **kwargs):
+        """
+        This method performs the requests to the API.
+        See `Client.request`, kwargs are passed to httpx.AsyncClient.request.
+        """
+        if "access_token" in kwargs:
+            return await self.with_token(kwargs.pop("access_token")).request(method, url, **kwargs)
+
+        idempotent = kwargs.pop("idempotent", None)
+        params = kwargs.pop("params", {})
+        headers = self.build_headers(method, params, kwargs.pop("headers", None))
+        cache_key = self.build_cache_key(method, url, params)
+        if cache_key is not None:
+            hit, result = self.cache.get(cache_key)
+            if hit:
+                return result
+
+        async def fetch():
+            result = await self.send_with_retries(method, url, headers, params, idempotent, **kwargs)
+            if cache_key is not None:
+                self.cache.set(cache_key, result)
+            return result
+
+        if self.single_flight is not None and method.lower() == "get":
+            from tiktok_marketing.singleflight import build_flight_key
+
+            access_token = params.get("access_token", self.access_token)
+            flight_key = build_flight_key(method, url, params, access_token)
+            return await self.single_flight.do_async(flight_key, fetch)
+
+        return await fetch()
+
+    async def send_with_retries(
+        self,
+        method,
+        url,
+        headers: dict,
+        params: dict,
+        idempotent: bool = None,
+        **kwargs,
+    ):
+        """This method sends the request, retrying it according to the retry policy."""
+
+        def call(attempt_number):
+            return self.attempt(method, url, headers=headers, params=params, attempt_number=attempt_number, **kwargs)
+
+        return await self.call_with_retries(method, url, call, idempotent)
+
+    async def call_with_retries(self, method, url, call, idempotent: bool = None):
+        """Same as `Client.call_with_retries`, `call(attempt_number)` returns an awaitable."""
+        if self.retry_policy is None:
+            return await call(1)
+
+        if idempotent is None:
+            idempotent = self.retry_policy.is_idempotent(method, self.get_endpoint(url))
+        if self.retry_policy.budget is not None:
+            self.retry_policy.budget.deposit()
+
+        attempts = []
+        while True:
+            try:
+                return await call(len(attempts) + 1)
+            except Exception as e:
+                backoff = self.get_retry_backoff(method, url, e, attempts, idempotent)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(cap_delay(backoff))
+
+    async def attempt(self, method, url, headers: dict, params: dict, attempt_number: int = 1, **kwargs):
+        """This method waits for the rate limiter and sends a single request."""
+        check_deadline()
+        key = None
+        wait = 0.0
+        if self.rate_limiter is not None:
+            key = self.build_rate_limit_key(url, params)
+            wait = await self.rate_limiter.acquire_async(key)
+
+        try:
+            result = await self.send(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                attempt_number=attempt_number,
+                rate_limit_wait=wait,
+                **kwargs,
+            )
+        except TooManyRequestsError as e:
+            self.throttled(key, method, url, e, attempt_number)
+            raise
+
+        if key is not None:
+            self.rate_limiter.succeeded(key)
+        return result
+
+    async def send(
+        self,
+        method,
+        url,
+        headers: dict,
+        params: dict,
+        attempt_number: int = 1,
+        rate_limit_wait: float = 0.0,
+        **kwargs,
+    ):
+        """This method sends a single request and returns the parsed response."""
+        body = None
+        if kwargs.get("json") is not None:
+            body = kwargs["content"] = self.json_backend.dumps(kwargs.pop("json"))
+
+        kwargs["timeout"] = self.build_timeout(get_timeout(kwargs.get("timeout", self.timeout)))
+
+        if not self.hooks:
+            response = await self.session_request(method, url, headers, params, **kwargs)
+            return self.parse_response(response)
+
+        event = self.build_request_event(method, url, body, attempt_number, rate_limit_wait)
+        started = time.perf_counter()
+        try:
+            response = await self.session_request(
+                method,
+                url,
+                headers,
+                params,
+                extensions=dict(trace=self.build_trace(event.timings)),
+                **kwargs,
+            )
+            event.timings.update(response=response.elapsed.total_seconds())
+            return self.parse_response(response, event)
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            event.timings.update(total=time.perf_counter() - started)
+            emit(self.hooks, event)
+
+    async def session_request(self, method, url, headers: dict, params: dict, **kwargs) -> "httpx.Response":
+        try:
+            return await self.session.request(
+                method,
+                url,
+                headers=headers,
+                params=self.build_params(params),
+                **kwargs,
+            )
+        except self.timeout_errors as e:
+            self.raise_if_deadline_exceeded(e)
+            raise
+
+    @staticmethod
+    def build_timeout(timeout) -> "httpx.Timeout":
+        """This method converts a requests style timeout, a number or (connect, read), to httpx.Timeout."""
+        if isinstance(timeout, httpx.Timeout):
+            return timeout
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    @staticmethod
+    def build_trace(timings: dict):
+        """This method returns an httpx trace callback recording the connect and tls timings."""
+        phases = {"connection.connect_tcp": "connect", "connection.start_tls": "tls"}
+        started = {}
+
+        async def trace(name: str, info: dict):
+            phase, _, state = name.rpartition(".")
+            if phase not in phases:
+                return
+            if state == "started":
+                started[phase] = time.perf_counter()
+            elif state == "complete" and phase in started:
+                timings[phases[phase]] = time.perf_counter() - started.pop(phase)
+
+        return trace
+
+    async def download(
+        self,
+        url: str,
+        file,
+        params: dict = None,
+        chunk_size: int = 1024 * 1024,
+        resume: bool = False,
+        timeout=None,
+    ) -> int:
+        """
+        This method streams the response body to a file in chunks, see `Client.download`.
+        """
+        params = params or {}
+        headers = self.build_headers("get", params)
+        position = get_position(file)
+
+        def call(attempt_number):
+            if attempt_number > 1:
+                rewind(file, position)
+            return self.attempt_download(url, file, headers, params, chunk_size, resume, attempt_number, timeout)
+
+        return await self.call_with_retries("get", url, call, idempotent=is_path(file) or position is not None)
+
+    async def attempt_download(
+        self, url, file, headers, params, chunk_size, resume, attempt_number=1, timeout=None
+    ) -> int:
+        """This method waits for the rate limiter and streams a single download."""
+        check_deadline()
+        headers = dict(headers)
+        offset = get_resume_offset(file, resume)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        key = None
+        wait = 0.0
+        if self.rate_limiter is not None:
+            key = self.build_rate_limit_key(url, params)
+            wait = await self.rate_limiter.acquire_async(key)
+
+        event = self.build_request_event("get", url, None, attempt_number, wait) if self.hooks else None
+        request = self.session.build_request(
+            "get",
+            url,
+            headers=headers,
+            params=self.build_params(params),
+            timeout=self.build_timeout(get_timeout(self.timeout if timeout is None else timeout)),
+            extensions=dict(trace=self.build_trace(event.timings)) if event is not None else None,
+        )
+        started = time.perf_counter()
+        try:
+            response = await self.session.send(request, stream=True)
+            try:
+                if event is not None:
+                    event.status_code = response.status_code
+                    event.timings.update(response=time.perf_counter() - started)
+                size = await self.write_download(response, file, offset, chunk_size, event)
+            finally:
+                await response.aclose()
+        except self.timeout_errors as e:
+            if event is not None:
+                event.error = e
+            self.raise_if_deadline_exceeded(e)
+            raise
+        except TooManyRequestsError as e:
+            self.throttled(key, "get", url, e, attempt_number)
+            if event is not None:
+                event.error = e
+            raise
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                event.timings.update(total=time.perf_counter() - started)
+                emit(self.hooks, event)
+
+        if key is not None:
+            self.rate_limiter.succeeded(key)
+        return size
+
+    async def write_download(self, response: "httpx.Response", file, offset: int, chunk_size: int, event=None) -> int:
+        if offset and response.status_code == 416:
+            return offset
+
+        if response.status_code >= 400 or self.is_json_response(response):
+            await response.aread()
+            self.parse_response(response, event)
+
+        append = bool(offset) and response.status_code == 206
+        written = await awrite_chunks(response.aiter_bytes(chunk_size), file, append=append)
+        if event is not None:
+            event.response_bytes = written
+        return written + offset if append else written
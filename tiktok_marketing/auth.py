@@ -3,7 +3,11 @@ from tiktok_marketing.module import Module
 
 class Auth(Module):
     def set_access_token(self, token: str):
-        """This method sets the access token needed for API calls."""
+        """
+        This method sets the access token needed for API calls.
+        It changes the token of every caller of this client, when the client is shared by
+        many threads or tasks use `TikTokClient.with_token` instead.
+        """
         self.client.set_access_token(token)
 
     def get_authorization_url(self, redirect_uri, state=None) -> str:
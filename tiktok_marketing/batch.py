@@ -0,0 +1,195 @@
+"""
+Helpers to run many API calls concurrently with a bounded number of workers.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from tiktok_marketing.deadline import run_in_context
+from tiktok_marketing.exceptions import DeadlineExceededError
+
+
+class BatchResult(list):
+    """
+    List of results in input order.
+    Failures don't abort the batch, they are kept in `errors` keyed by page, chunk or item.
+    """
+
+    def __init__(self, iterable=(), errors: dict = None):
+        super().__init__(iterable)
+        self.errors = errors if errors is not None else {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class BulkOutcome:
+    """Outcome of one item of a bulk operation, error is None when it succeeded."""
+
+    __slots__ = ("item", "result", "error")
+
+    def __init__(self, item, result=None, error: Exception = None) -> None:
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BulkOutcome({self.item!r}, result={self.result!r})"
+        return f"BulkOutcome({self.item!r}, error={self.error!r})"
+
+
+class BulkSummary:
+    """
+    Outcomes of a bulk operation, split in `succeeded` and `failed` lists of `BulkOutcome`.
+    `errors_by_type()` groups the failures by exception class, e.g. InvalidParameterError.
+    """
+
+    def __init__(self) -> None:
+        self.succeeded = []
+        self.failed = []
+
+    def add(self, outcome: BulkOutcome) -> None:
+        (self.succeeded if outcome.ok else self.failed).append(outcome)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def errors_by_type(self) -> dict:
+        """This method returns exception class name -> list of failed outcomes."""
+        errors = {}
+        for outcome in self.failed:
+            errors.setdefault(type(outcome.error).__name__, []).append(outcome)
+        return errors
+
+    def __repr__(self) -> str:
+        failed = {name: len(outcomes) for name, outcomes in self.errors_by_type().items()}
+        return f"BulkSummary(succeeded={len(self.succeeded)}, failed={failed})"
+
+
+def map_concurrently(func, items, max_workers: int = 8):
+    """
+    This method calls func for every item using a pool of threads.
+
+    ## Returns
+    - tuple (results, errors)
+        - results: list aligned with items, None for the items that failed.
+        - errors: dict of item index -> exception.
+
+    A DeadlineExceededError isn't kept in errors, it's raised and the calls that haven't started are cancelled.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    errors = {}
+    if not items:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        futures = [run_in_context(executor, func, item) for item in items]
+        try:
+            for index, future in enumerate(futures):
+                try:
+                    results[index] = future.result()
+                except DeadlineExceededError:
+                    raise
+                except Exception as e:
+                    errors[index] = e
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return results, errors
+
+
+async def amap_concurrently(func, items, max_workers: int = 8):
+    """Same as `map_concurrently` but func returns an awaitable, concurrency is bounded by a semaphore."""
+    items = list(items)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def call(item):
+        async with semaphore:
+            return await func(item)
+
+    tasks = [asyncio.ensure_future(call(item)) for item in items]
+    results = [None] * len(items)
+    errors = {}
+    try:
+        for index, task in enumerate(tasks):
+            try:
+                results[index] = await task
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                errors[index] = e
+    finally:
+        cancel_tasks(tasks)
+
+    return results, errors
+
+
+def cancel_tasks(tasks: list) -> None:
+    """This method cancels the pending tasks and retrieves the errors of the finished ones nobody awaited."""
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
+
+
+def iter_concurrently(func, items, max_workers: int = 8):
+    """
+    This generator calls func for every item using a pool of threads and yields
+    (index, result, error) tuples as the calls complete, error is None when the call succeeded.
+    Calls that haven't started are cancelled if the consumer stops early or a DeadlineExceededError is raised.
+    """
+    items = list(items)
+    if not items:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))))
+    futures = {run_in_context(executor, func, item): index for index, item in enumerate(items)}
+    try:
+        for future in as_completed(futures):
+            try:
+                outcome = (futures[future], future.result(), None)
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                outcome = (futures[future], None, e)
+            yield outcome
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_concurrently(func, items, max_workers: int = 8):
+    """Same as `iter_concurrently` but func returns an awaitable, concurrency is bounded by a semaphore."""
+    items = list(items)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def call(index, item):
+        async with semaphore:
+            try:
+                return index, await func(item), None
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                return index, None, e
+
+    tasks = [asyncio.ensure_future(call(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        cancel_tasks(tasks)
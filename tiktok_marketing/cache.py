@@ -0,0 +1,134 @@
+"""
+Response cache for read-mostly endpoints.
+
+Entries are kept in memory with a TTL per endpoint and evicted in LRU order.
+An optional SQLite file keeps a second tier that survives process restarts.
+Keys include the access token and the parameters so tenants never share entries.
+"""
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    Opt-in cache of GET responses.
+
+    ## Parameters
+    - ttls: dict, optional
+        - endpoint -> seconds, only these endpoints are cached, default: DEFAULT_TTLS.
+    - maxsize: int, optional, default: 1024
+        - maximum number of entries kept in memory.
+    - path: str, optional
+        - SQLite file used as a disk tier.
+
+    ## Example
+
+        cache = ResponseCache(ttls={"user/info/": 600}, path="tiktok_cache.db")
+        client = TikTokClient(app_id, secret, cache=cache)
+    """
+
+    DEFAULT_TTLS = {
+        "user/info/": 300,
+        "oauth2/advertiser/get/": 300,
+        "advertiser/info/": 300,
+        "pages/library/get/": 300,
+    }
+
+    def __init__(self, ttls: dict = None, maxsize: int = 1024, path: str = None) -> None:
+        self.ttls = dict(ttls if ttls is not None else self.DEFAULT_TTLS)
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, endpoint TEXT, token TEXT, expires_at REAL, value TEXT)"
+            )
+
+    def is_cacheable(self, method: str, endpoint: str) -> bool:
+        return method.lower() == "get" and endpoint in self.ttls
+
+    def hash_token(self, access_token: str) -> str:
+        return hashlib.sha256(str(access_token).encode()).hexdigest()
+
+    def build_key(self, endpoint: str, params: dict, access_token: str = None) -> tuple:
+        """This method returns the key of a call, made of the endpoint, the token and the parameters."""
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{endpoint}\n{access_token}\n{encoded}".encode()).hexdigest()
+        return (endpoint, self.hash_token(access_token), digest)
+
+    def get(self, key: tuple):
+        """
+        This method returns a tuple (hit, value).
+        The value is a copy so callers can't change the cached data.
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    return True, copy.deepcopy(value)
+                del self.entries[key]
+
+            if self.db is None:
+                return False, None
+
+            row = self.db.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key[2],)
+            ).fetchone()
+            if row is None or row[0] <= now:
+                return False, None
+
+            value = json.loads(row[1])
+            self._store(key, row[0], value)
+            return True, copy.deepcopy(value)
+
+    def set(self, key: tuple, value) -> None:
+        endpoint, token, digest = key
+        expires_at = time.time() + self.ttls.get(endpoint, 0)
+        with self.lock:
+            self._store(key, expires_at, copy.deepcopy(value))
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (digest, endpoint, token, expires_at, json.dumps(value)),
+                )
+
+    def _store(self, key: tuple, expires_at: float, value) -> None:
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str = None, access_token: str = None) -> None:
+        """
+        This method removes the entries of an endpoint and/or an access token,
+        every entry is removed if none is given.
+        """
+        token = self.hash_token(access_token) if access_token is not None else None
+        with self.lock:
+            for key in list(self.entries):
+                if (endpoint is None or key[0] == endpoint) and (token is None or key[1] == token):
+                    del self.entries[key]
+
+            if self.db is not None:
+                self.db.execute(
+                    "DELETE FROM responses WHERE (? IS NULL OR endpoint = ?) AND (? IS NULL OR token = ?)",
+                    (endpoint, endpoint, token, token),
+                )
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
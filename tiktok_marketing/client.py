@@ -1,17 +1,60 @@
+import copy
+import logging
+import time
 import requests
+from typing import TYPE_CHECKING
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
 from urllib.parse import urlencode
+from tiktok_marketing.deadline import cap_delay
+from tiktok_marketing.deadline import check_deadline
+from tiktok_marketing.deadline import current_deadline
+from tiktok_marketing.deadline import get_timeout
+from tiktok_marketing.download import get_position
+from tiktok_marketing.download import get_resume_offset
+from tiktok_marketing.download import is_path
+from tiktok_marketing.download import rewind
+from tiktok_marketing.download import write_chunks
+from tiktok_marketing.exceptions import BaseError
+from tiktok_marketing.exceptions import DeadlineExceededError
 from tiktok_marketing.exceptions import ExceptionFactory
+from tiktok_marketing.exceptions import TooManyRequestsError
+from tiktok_marketing.instrumentation import RequestEvent
+from tiktok_marketing.instrumentation import emit
+from tiktok_marketing.jsonlib import JSONBackend
+from tiktok_marketing.jsonlib import default_backend
+from tiktok_marketing.jsonlib import get_backend
+
+if TYPE_CHECKING:  # pragma: no cover
+    # these features are opt-in, don't import them (sqlite3, concurrent.futures) on every start
+    from tiktok_marketing.cache import ResponseCache
+    from tiktok_marketing.rate_limit import RateLimiter
+    from tiktok_marketing.retry import RetryPolicy
+    from tiktok_marketing.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 class Client:
     """
     Requests library wrapper to perform calls to tiktok marketing api.
+
+    A client can be shared by many threads as long as its access token isn't changed while it's in use.
+    To call the API with different tokens use `with_token`, or pass `access_token` to a single call,
+    instead of `set_access_token`.
+
+    Requests time out after DEFAULT_TIMEOUT, (connect, read) seconds, unless another `timeout` is given
+    to the client, to `with_timeout` or to a single call. See `deadline.Deadline` for a time budget
+    shared by the requests of a whole operation.
     """
 
     API_URL = "https://business-api.tiktok.com/open_api/v1.2/"
     SANDBOX_URL = "https://sandbox-ads.tiktok.com/open_api/v1.2/"
     AUTHORIZATION_URL = "https://ads.tiktok.com/marketing_api/auth"
+    DEFAULT_TIMEOUT = (10.0, 60.0)
+    is_async = False
+    transport_errors = (requests.ConnectionError, requests.Timeout)
+    timeout_errors = (requests.Timeout,)
 
     def __init__(
         self,
@@ -19,17 +62,147 @@ class Client:
         secret: str = None,
         access_token: str = None,
         sandbox: bool = False,
+        session: requests.Session = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        rate_limiter: "RateLimiter" = None,
+        retry_policy: "RetryPolicy" = None,
+        cache: "ResponseCache" = None,
+        single_flight: "SingleFlight" = None,
+        json_backend=None,
+        hooks: list = None,
+        timeout=DEFAULT_TIMEOUT,
     ):
-        """Initialize required parameters for API access."""
+        """
+        Initialize required parameters for API access.
+
+        ## Parameters
+        - session: requests.Session, optional
+            - A session to share between several clients, see `create_session`.
+            The client will not close a session it did not create.
+        - pool_connections: int, optional, default: 10
+            - Number of hosts to keep connection pools for.
+        - pool_maxsize: int, optional, default: 10
+            - Maximum number of keep-alive connections per host.
+        - pool_block: bool, optional, default: False
+            - If True, block when all the connections of a host are in use
+            instead of opening extra connections that won't be kept alive.
+        - rate_limiter: RateLimiter, optional
+            - Limiter applied to every call, it can be shared between clients.
+        - retry_policy: RetryPolicy, optional
+            - Retry transient errors with exponential backoff, by default calls are not retried.
+        - cache: ResponseCache, optional
+            - Cache the responses of read-mostly endpoints, by default nothing is cached.
+        - single_flight: SingleFlight, optional
+            - Concurrent identical GET calls share a single request, it can be shared between clients.
+        - json_backend: str or JSONBackend, optional
+            - orjson, ujson or json, by default the fastest installed one.
+        - hooks: list, optional
+            - callables that receive an `instrumentation.RequestEvent` for every request,
+            retry and throttling error, e.g. `instrumentation.MetricsCollector()`.
+        - timeout: float or tuple, optional, default: DEFAULT_TIMEOUT
+            - seconds, or (connect, read) seconds, before a request times out, None waits forever.
+        """
         self.app_id = app_id
         self.secret = secret
         self.access_token = access_token
         self.sandbox = sandbox
         self.exceptions = ExceptionFactory()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.single_flight = single_flight
+        if json_backend is None:
+            json_backend = default_backend
+        elif not isinstance(json_backend, JSONBackend):
+            json_backend = get_backend(json_backend)
+        self.json_backend = json_backend
+        self.hooks = list(hooks or [])
+        self.timeout = timeout
+        self._owns_session = session is None
+        if session is None:
+            session = self.create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+        self.session = session
+
+    @staticmethod
+    def create_session(
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+    ) -> requests.Session:
+        """
+        This method returns a requests.Session with a keep-alive connection pool.
+        The session can be passed to several clients to share the same pool.
+
+        ## Parameters
+        - pool_connections: int, optional, default: 10
+            - Number of hosts to keep connection pools for.
+        - pool_maxsize: int, optional, default: 10
+            - Maximum number of keep-alive connections per host.
+        - pool_block: bool, optional, default: False
+            - If True, block when all the connections of a host are in use.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """This method releases the pooled connections if the session is owned by the client."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add_hook(self, hook) -> None:
+        """This method registers a callable that receives an `instrumentation.RequestEvent` per event."""
+        self.hooks.append(hook)
 
     def set_access_token(self, access_token):
+        """
+        This method changes the access token of the client.
+        It's not safe while other threads use the client, see `with_token`.
+        """
         self.access_token = access_token
 
+    def with_token(self, access_token: str) -> "Client":
+        """
+        This method returns a copy of the client bound to another access token.
+        The copy shares the connection pool, rate limiter, retry policy, cache and single-flight,
+        it's cheap to create and it never closes the shared connection pool.
+        """
+        client = copy.copy(self)
+        client.access_token = access_token
+        client._owns_session = False
+        return client
+
+    def with_timeout(self, timeout) -> "Client":
+        """
+        This method returns a copy of the client with another default timeout, see `with_token`.
+
+        ## Parameters
+        - timeout: float or tuple
+            - seconds, or (connect, read) seconds, None waits forever.
+        """
+        client = copy.copy(self)
+        client.timeout = timeout
+        client._owns_session = False
+        return client
+
     def get_access_token(self):
         return self.access_token
 
@@ -61,6 +234,30 @@ class Client:
         base_url = self.API_URL if not self.sandbox else self.SANDBOX_URL
         return urljoin(base_url, endpoint.lstrip("/"))
 
+    def get_endpoint(self, url: str) -> str:
+        """This method returns the endpoint of a full url, e.g. pages/get/."""
+        base_url = self.API_URL if not self.sandbox else self.SANDBOX_URL
+        if url.startswith(base_url):
+            return url[len(base_url) :]
+        return url
+
+    def build_rate_limit_key(self, url: str, params: dict) -> tuple:
+        """This method returns the rate limiter key of a call."""
+        return self.rate_limiter.build_key(
+            app_id=self.app_id,
+            access_token=params.get("access_token", self.access_token),
+            endpoint=self.get_endpoint(url),
+        )
+
+    def build_cache_key(self, method: str, url: str, params: dict):
+        """This method returns the cache key of a call, None if the call is not cached."""
+        endpoint = self.get_endpoint(url)
+        if self.cache is None or not self.cache.is_cacheable(method, endpoint):
+            return None
+
+        access_token = params.get("access_token", self.access_token)
+        return self.cache.build_key(endpoint, params, access_token)
+
     def build_authorization_url(self, redirect_uri, state=None) -> str:
         """
         This method returns the oauth authorization url.
@@ -88,6 +285,32 @@ class Client:
         app_data = self.build_app_data(auth_code=auth_code)
         return app_data
 
+    def build_headers(self, method: str, params: dict, headers: dict = None) -> dict:
+        """
+        This method returns the request headers.
+        If access_token is set and it is not sent in the params it will be added to the headers.
+        If method is post or put Content-Type: application/json will be added to the headers.
+        """
+        headers = dict(headers or {})
+        if self.access_token is not None and "access_token" not in params:
+            headers["Access-Token"] = self.access_token
+
+        if method in ["post", "put"]:
+            headers["Content-Type"] = "application/json"
+
+        return headers
+
+    def build_params(self, params: dict) -> dict:
+        """
+        This method returns the query string parameters.
+        The API expects lists and objects in GET parameters to be JSON encoded.
+        """
+        dumps = self.json_backend.dumps
+        return {
+            key: dumps(value).decode() if isinstance(value, (list, tuple, dict)) else value
+            for key, value in params.items()
+        }
+
     def request(self, method, url, **kwargs):
         """
         This method performs the requests to the API.
@@ -101,54 +324,356 @@ class Client:
             - can be any url but TikTok API endpoints are expected
             - use build_url beforehand to get the endpoint full path.
         - kwargs: dict
+            - access_token: str, optional, use this token instead of the client's for this call.
+            - timeout: float or tuple, optional, use this timeout instead of the client's for this call.
+            - idempotent: bool, optional, whether the call can be retried safely,
+            by default it depends on the method and the endpoint, see RetryPolicy.
             - any other parameters that can be passed to the requests library.
             - keep allow_redirects=True
         """
-        headers = kwargs.pop("headers", {})
+        if "access_token" in kwargs:
+            return self.with_token(kwargs.pop("access_token")).request(method, url, **kwargs)
+
+        idempotent = kwargs.pop("idempotent", None)
         params = kwargs.pop("params", {})
-        if self.access_token is not None and "access_token" not in params:
-            headers["Access-Token"] = self.access_token
+        headers = self.build_headers(method, params, kwargs.pop("headers", None))
+        cache_key = self.build_cache_key(method, url, params)
+        if cache_key is not None:
+            hit, result = self.cache.get(cache_key)
+            if hit:
+                return result
 
-        if method in ["post", "put"]:
-            headers["Content-Type"] = "application/json"
+        def fetch():
+            result = self.send_with_retries(method, url, headers, params, idempotent, **kwargs)
+            if cache_key is not None:
+                self.cache.set(cache_key, result)
+            return result
+
+        if self.single_flight is not None and method.lower() == "get":
+            from tiktok_marketing.singleflight import build_flight_key
+
+            access_token = params.get("access_token", self.access_token)
+            flight_key = build_flight_key(method, url, params, access_token)
+            return self.single_flight.do(flight_key, fetch)
 
-        response = requests.request(
+        return fetch()
+
+    def send_with_retries(
+        self,
+        method,
+        url,
+        headers: dict,
+        params: dict,
+        idempotent: bool = None,
+        **kwargs,
+    ):
+        """This method sends the request, retrying it according to the retry policy."""
+
+        def call(attempt_number):
+            return self.attempt(method, url, headers=headers, params=params, attempt_number=attempt_number, **kwargs)
+
+        return self.call_with_retries(method, url, call, idempotent)
+
+    def call_with_retries(self, method, url, call, idempotent: bool = None):
+        """This method calls `call(attempt_number)`, calling it again according to the retry policy."""
+        if self.retry_policy is None:
+            return call(1)
+
+        if idempotent is None:
+            idempotent = self.retry_policy.is_idempotent(method, self.get_endpoint(url))
+        if self.retry_policy.budget is not None:
+            self.retry_policy.budget.deposit()
+
+        attempts = []
+        while True:
+            try:
+                return call(len(attempts) + 1)
+            except Exception as e:
+                backoff = self.get_retry_backoff(method, url, e, attempts, idempotent)
+                if backoff is None:
+                    raise
+                time.sleep(cap_delay(backoff))
+
+    def get_retry_backoff(self, method: str, url: str, error: Exception, attempts: list, idempotent: bool):
+        """
+        This method records the failed attempt and returns the seconds to wait before retrying,
+        None if the error must be raised. The attempts are available in `error.attempts`.
+        """
+        transport = isinstance(error, self.transport_errors)
+        if not transport and not isinstance(error, BaseError):
+            return None
+
+        retry = self.retry_policy.should_retry(error, len(attempts), idempotent, transport)
+        backoff = self.retry_policy.get_backoff(len(attempts)) if retry else None
+        attempts.append(dict(attempt=len(attempts) + 1, error=error, backoff=backoff))
+        error.attempts = attempts
+        if backoff is not None and self.hooks:
+            event = RequestEvent(
+                "retry",
+                self.get_endpoint(url),
+                method,
+                url,
+                code=getattr(error, "code", None),
+                attempt=len(attempts),
+                backoff=backoff,
+                error=error,
+            )
+            emit(self.hooks, event)
+        return backoff
+
+    def attempt(self, method, url, headers: dict, params: dict, attempt_number: int = 1, **kwargs):
+        """This method waits for the rate limiter and sends a single request."""
+        check_deadline()
+        key = None
+        wait = 0.0
+        if self.rate_limiter is not None:
+            key = self.build_rate_limit_key(url, params)
+            wait = self.rate_limiter.acquire(key)
+
+        try:
+            result = self.send(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                attempt_number=attempt_number,
+                rate_limit_wait=wait,
+                **kwargs,
+            )
+        except TooManyRequestsError as e:
+            self.throttled(key, method, url, e, attempt_number)
+            raise
+
+        if key is not None:
+            self.rate_limiter.succeeded(key)
+        return result
+
+    def throttled(self, key, method: str, url: str, error: Exception, attempt_number: int) -> None:
+        """This method slows the rate limiter down and reports the throttling error to the hooks."""
+        if key is not None:
+            self.rate_limiter.throttled(key)
+        if self.hooks:
+            event = RequestEvent(
+                "throttle",
+                self.get_endpoint(url),
+                method,
+                url,
+                code=error.code,
+                attempt=attempt_number,
+                error=error,
+            )
+            emit(self.hooks, event)
+
+    def send(
+        self,
+        method,
+        url,
+        headers: dict,
+        params: dict,
+        attempt_number: int = 1,
+        rate_limit_wait: float = 0.0,
+        **kwargs,
+    ):
+        """This method sends a single request and returns the parsed response."""
+        body = None
+        if kwargs.get("json") is not None:
+            body = kwargs["data"] = self.json_backend.dumps(kwargs.pop("json"))
+        kwargs["timeout"] = get_timeout(kwargs.get("timeout", self.timeout))
+
+        if not self.hooks:
+            response = self.session_request(method, url, headers, params, **kwargs)
+            return self.parse_response(response)
+
+        event = self.build_request_event(method, url, body, attempt_number, rate_limit_wait)
+        started = time.perf_counter()
+        try:
+            response = self.session_request(method, url, headers, params, **kwargs)
+            event.timings.update(response=response.elapsed.total_seconds())
+            return self.parse_response(response, event)
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            event.timings.update(total=time.perf_counter() - started)
+            emit(self.hooks, event)
+
+    def session_request(self, method, url, headers: dict, params: dict, **kwargs) -> requests.Response:
+        try:
+            return self.session.request(
+                method,
+                url,
+                headers=headers,
+                params=self.build_params(params),
+                allow_redirects=True,
+                **kwargs,
+            )
+        except self.timeout_errors as e:
+            self.raise_if_deadline_exceeded(e)
+            raise
+
+    def raise_if_deadline_exceeded(self, error: Exception) -> None:
+        """This method raises DeadlineExceededError if a request timed out because the deadline passed."""
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError(f"Deadline of {deadline.seconds}s exceeded", None) from error
+
+    def build_request_event(self, method, url, body, attempt_number, rate_limit_wait) -> RequestEvent:
+        return RequestEvent(
+            "request",
+            self.get_endpoint(url),
             method,
             url,
-            headers=headers,
-            params=params,
-            allow_redirects=True,
-            **kwargs,
+            request_bytes=len(body or b""),
+            attempt=attempt_number,
+            timings=dict(rate_limit=rate_limit_wait),
         )
-        return self.parse_response(response)
 
-    def parse_response(self, response: requests.Response):
+    def download(
+        self,
+        url: str,
+        file,
+        params: dict = None,
+        chunk_size: int = 1024 * 1024,
+        resume: bool = False,
+        timeout=None,
+    ) -> int:
+        """
+        This method streams the response body to a file in chunks, it never sits fully in memory.
+        Error responses are decoded and raised as in `parse_response`.
+        Downloads go through the rate limiter, the retry policy and the hooks like other requests.
+        A failed attempt is retried from the start of the file, or from the partial download with resume,
+        file objects are only rewound when they're seekable, otherwise only throttling errors are retried.
+
+        ## Parameters
+        - url: str
+        - file: str, os.PathLike or binary file object
+        - params: dict, optional
+        - chunk_size: int, optional, default: 1 MiB
+        - resume: bool, optional, default: False
+            - if file is a path to a partial download, only request the missing bytes
+            and append them. The file is rewritten if the server ignores the range.
+        - timeout: float or tuple, optional
+            - use this timeout instead of the client's for every attempt, e.g. for large files.
+
+        ## Returns
+        - int, the size of the file.
+        """
+        params = params or {}
+        headers = self.build_headers("get", params)
+        position = get_position(file)
+
+        def call(attempt_number):
+            if attempt_number > 1:
+                rewind(file, position)
+            return self.attempt_download(url, file, headers, params, chunk_size, resume, attempt_number, timeout)
+
+        return self.call_with_retries("get", url, call, idempotent=is_path(file) or position is not None)
+
+    def attempt_download(self, url, file, headers, params, chunk_size, resume, attempt_number=1, timeout=None) -> int:
+        """This method waits for the rate limiter and streams a single download, see `download`."""
+        check_deadline()
+        headers = dict(headers)
+        offset = get_resume_offset(file, resume)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        key = None
+        wait = 0.0
+        if self.rate_limiter is not None:
+            key = self.build_rate_limit_key(url, params)
+            wait = self.rate_limiter.acquire(key)
+
+        event = self.build_request_event("get", url, None, attempt_number, wait) if self.hooks else None
+        started = time.perf_counter()
+        try:
+            with self.session_request(
+                "get",
+                url,
+                headers,
+                params,
+                stream=True,
+                timeout=get_timeout(self.timeout if timeout is None else timeout),
+            ) as response:
+                if event is not None:
+                    event.status_code = response.status_code
+                    event.timings.update(response=response.elapsed.total_seconds())
+                size = self.write_download(response, file, offset, chunk_size, event)
+        except TooManyRequestsError as e:
+            self.throttled(key, "get", url, e, attempt_number)
+            if event is not None:
+                event.error = e
+            raise
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                event.timings.update(total=time.perf_counter() - started)
+                emit(self.hooks, event)
+
+        if key is not None:
+            self.rate_limiter.succeeded(key)
+        return size
+
+    def write_download(self, response: requests.Response, file, offset: int, chunk_size: int, event=None) -> int:
+        if offset and response.status_code == 416:
+            return offset
+
+        if response.status_code >= 400 or self.is_json_response(response):
+            self.parse_response(response, event)
+
+        append = bool(offset) and response.status_code == 206
+        written = write_chunks(response.iter_content(chunk_size), file, append=append)
+        if event is not None:
+            event.response_bytes = written
+        return written + offset if append else written
+
+    def is_json_response(self, response) -> bool:
+        return response.headers.get("Content-Type", "").startswith("application/json")
+
+    def parse_response(self, response: requests.Response, event: RequestEvent = None):
         """
         This method decodes the response if there's any problem it will raise a custom exception.
 
         ## Parameters
-        - response: requests.Response
+        - response: requests.Response or httpx.Response
+        - event: RequestEvent, optional
+            - filled with the status, the TikTok code, the request_id and the response size.
         """
+        status_code = response.status_code
+        content = response.content
         try:
-            status_code = response.status_code
-            rsp = response.json()
-            tiktok_code = int(rsp.get("code", 0))
-        except:
+            rsp = self.json_backend.loads(content)
+        except ValueError:
             rsp = response.text
-        finally:
-            if not response.ok:
-                message = None
-                if "error" in rsp:
-                    message = rsp["error"]
-
-                raise self.exceptions.get_exception(status_code, message, rsp)
-
-            if "code" in rsp and tiktok_code != 0:
-                message = rsp.get("message", None)
-                print(rsp)
-                raise self.exceptions.get_exception(tiktok_code, message, rsp)
-
-            if "data" in rsp and isinstance(rsp, dict):
-                return rsp.get("data", {})
-            else:
-                return rsp
+
+        if event is not None:
+            event.status_code = status_code
+            event.response_bytes = len(content)
+            if isinstance(rsp, dict):
+                event.code = rsp.get("code")
+                event.request_id = rsp.get("request_id")
+
+        if status_code >= 400:
+            message = rsp.get("error", None) if isinstance(rsp, dict) else None
+            raise self.exceptions.get_exception(status_code, message, rsp)
+
+        if not isinstance(rsp, dict):
+            return rsp
+
+        tiktok_code = int(rsp.get("code", 0) or 0)
+        if tiktok_code != 0:
+            message = rsp.get("message", None)
+            # the error is raised, it's only logged for applications that collect debug logs
+            logger.debug(
+                "TikTok API error %s: %s",
+                tiktok_code,
+                message,
+                extra=dict(tiktok_code=tiktok_code, request_id=rsp.get("request_id"), response=rsp),
+            )
+            raise self.exceptions.get_exception(tiktok_code, message, rsp)
+
+        if "data" in rsp:
+            return rsp.get("data", {})
+        return rsp
@@ -0,0 +1,184 @@
+"""
+Columnar results for large list and report responses.
+
+`Columns` builds one column per field while rows stream in. Integer fields such as page_id or
+create_time are kept in `array("q")` and float fields in `array("d")`, 8 bytes per value instead
+of a Python object, other fields are plain lists. `to_numpy()` returns NumPy arrays when NumPy is installed.
+
+Nested dicts, e.g. the `dimensions` and `metrics` of report rows, are flattened into their keys.
+
+    columns = to_columns(client.pages.iter_pages(advertiser_id=advertiser_id))
+    columns["update_time"]  # array('q', [...])
+
+    columns = client.reporting.get_report_columns(..., types=dict(spend=float, impressions=int))
+    columns.to_numpy()["spend"].sum()
+"""
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+INT_MIN = -(2**63)
+INT_MAX = 2**63 - 1
+
+
+def get_typecode(value):
+    """This method returns the array typecode to store value, None when it needs a list."""
+    value_type = type(value)
+    if value_type is int:
+        return "q" if INT_MIN <= value <= INT_MAX else None
+    if value_type is float:
+        return "d"
+    return None
+
+
+class Columns:
+    """
+    Per field columns of a list of rows.
+
+    ## Parameters
+    - types: dict, optional
+        - field -> callable applied to every value, e.g. float for report metrics returned as strings.
+        Values that can't be converted are kept as they are.
+    - flatten: bool, optional, default: True
+        - store the keys of nested dicts as columns.
+
+    A numeric column becomes a list when it gets a value of another type, a missing value or None.
+    Iterating over the columns yields the rows back as dicts, see `rows`.
+    `errors` keeps the pages that failed when the columns are built by `Pages.get_all_pages`.
+    """
+
+    def __init__(self, types: dict = None, flatten: bool = True) -> None:
+        self.types = types or {}
+        self.flatten = flatten
+        self.columns = {}
+        self.length = 0
+        self.errors = {}
+
+    @classmethod
+    def from_rows(cls, rows, types: dict = None, flatten: bool = True) -> "Columns":
+        columns = cls(types, flatten)
+        columns.extend(rows)
+        return columns
+
+    def append(self, row) -> None:
+        """This method adds a row, a dict or a `records.Record`."""
+        if hasattr(row, "to_dict"):
+            row = row.to_dict()
+        if self.flatten:
+            row = flatten_row(row)
+
+        for field in self.columns.keys() - row.keys():
+            self._add(field, None)
+        for field, value in row.items():
+            self._add(field, value)
+        self.length += 1
+
+    def extend(self, rows) -> None:
+        for row in rows:
+            self.append(row)
+
+    def _add(self, field: str, value) -> None:
+        convert = self.types.get(field)
+        if convert is not None and value is not None:
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                pass
+
+        column = self.columns.get(field)
+        if column is None:
+            typecode = get_typecode(value)
+            if typecode is None or self.length:
+                # earlier rows didn't have the field
+                column = self.columns[field] = [None] * self.length
+            else:
+                column = self.columns[field] = array(typecode)
+
+        if type(column) is list:
+            column.append(value)
+            return
+
+        typecode = get_typecode(value)
+        if typecode == column.typecode:
+            column.append(value)
+        elif typecode == "q" and column.typecode == "d":
+            column.append(float(value))
+        elif typecode == "d" and column.typecode == "q":
+            column = self.columns[field] = array("d", column)
+            column.append(value)
+        else:
+            column = self.columns[field] = column.tolist()
+            column.append(value)
+
+    @property
+    def fields(self) -> list:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, field: str):
+        return self.columns[field]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.columns
+
+    def __iter__(self):
+        return self.rows()
+
+    def to_dict(self) -> dict:
+        """This method returns field -> column, columns are array.array or list."""
+        return dict(self.columns)
+
+    def to_numpy(self) -> dict:
+        """This method returns field -> numpy.ndarray, int64 and float64 for numeric columns."""
+        if numpy is None:
+            raise ImportError("numpy is required for to_numpy, install it with: pip install numpy")
+        arrays = {}
+        for field, column in self.columns.items():
+            if type(column) is list:
+                arrays[field] = numpy.array(column, dtype=object)
+            else:
+                arrays[field] = numpy.frombuffer(column, dtype=column.typecode).copy()
+        return arrays
+
+    def rows(self):
+        """This generator yields the rows back as dicts."""
+        fields = self.fields
+        for values in zip(*(self.columns[field] for field in fields)):
+            yield dict(zip(fields, values))
+
+    def __repr__(self) -> str:
+        columns = ", ".join(
+            f"{field}: {'list' if type(column) is list else column.typecode}" for field, column in self.columns.items()
+        )
+        return f"Columns({self.length} rows, {columns})"
+
+
+def flatten_row(row: dict) -> dict:
+    """This method moves the keys of nested dicts to the top level."""
+    if not any(type(value) is dict for value in row.values()):
+        return row
+    flat = {}
+    for field, value in row.items():
+        if type(value) is dict:
+            flat.update(value)
+        else:
+            flat[field] = value
+    return flat
+
+
+def to_columns(rows, types: dict = None, flatten: bool = True) -> Columns:
+    """This method builds columns from an iterable of rows, e.g. `iter_pages`, as it is consumed."""
+    return Columns.from_rows(rows, types, flatten)
+
+
+async def ato_columns(rows, types: dict = None, flatten: bool = True) -> Columns:
+    """Same as `to_columns` for an async iterable, e.g. `aiter_pages`."""
+    columns = Columns(types, flatten)
+    async for row in rows:
+        columns.append(row)
+    return columns
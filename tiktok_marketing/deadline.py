@@ -0,0 +1,110 @@
+"""
+Deadlines for operations made of many requests.
+
+A Deadline is entered with `with` (or `async with`) and applies to every request made inside the block,
+including the pages of a paginated listing, retries and the polling of lead download tasks.
+Each request gets the remaining time as its timeout, and once the deadline has passed the operation
+stops with DeadlineExceededError. Deadlines are kept in a context variable, so they follow the
+prefetching threads and tasks of the library. Nested deadlines never extend the outer one.
+
+    with Deadline(30):
+        pages = list(client.pages.iter_pages(advertiser_id=advertiser_id))
+"""
+import contextvars
+import time
+
+from tiktok_marketing.exceptions import DeadlineExceededError
+
+current_deadline = contextvars.ContextVar("tiktok_marketing_deadline", default=None)
+
+
+class Deadline:
+    """
+    ## Parameters
+    - seconds: float
+        - time budget of the operation, counted from the creation of the deadline.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("seconds must not be negative.")
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._tokens = []
+
+    @staticmethod
+    def current() -> "Deadline":
+        """This method returns the deadline of the running operation, None when there's none."""
+        return current_deadline.get()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """This method raises DeadlineExceededError if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceededError(f"Deadline of {self.seconds}s exceeded", None)
+
+    def __enter__(self) -> "Deadline":
+        outer = current_deadline.get()
+        active = self if outer is None or self.expires_at < outer.expires_at else outer
+        self._tokens.append(current_deadline.set(active))
+        return self
+
+    def __exit__(self, *args) -> None:
+        current_deadline.reset(self._tokens.pop())
+
+    async def __aenter__(self) -> "Deadline":
+        return self.__enter__()
+
+    async def __aexit__(self, *args) -> None:
+        self.__exit__(*args)
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.seconds}, remaining={self.remaining():.3f})"
+
+
+def check_deadline() -> None:
+    """This method raises DeadlineExceededError if the deadline of the running operation has passed."""
+    deadline = current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def cap_delay(delay: float) -> float:
+    """
+    This method returns the delay to sleep before the next poll or retry unchanged,
+    or raises DeadlineExceededError when the deadline would pass before the delay ends.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return delay
+    if delay >= deadline.remaining():
+        raise DeadlineExceededError(f"Deadline of {deadline.seconds}s exceeded", None)
+    return delay
+
+
+def get_timeout(timeout):
+    """
+    This method returns the timeout of a request: the client timeout, a number or a (connect, read) tuple,
+    with every value cut to the remaining time of the deadline.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return timeout
+    deadline.check()
+    remaining = deadline.remaining()
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+    return min(timeout, remaining)
+
+
+def run_in_context(executor, func, *args):
+    """This method submits func to an executor with the context variables, and so the deadline, of the caller."""
+    return executor.submit(contextvars.copy_context().run, func, *args)
@@ -0,0 +1,123 @@
+"""
+Helpers to stream downloads to disk and to read downloaded lead files.
+
+Chunks are written as they arrive, a download never sits fully in memory.
+The deadline of the running operation is checked between chunks, see `deadline.Deadline`.
+
+Every chunk is the bytes object read from the connection and is handed to the file as it is,
+large writes skip the file buffer. Reading into a reused buffer wouldn't save a copy:
+urllib3's `readinto` reads a bytes object and copies it into the buffer, TLS is decrypted
+in user space and `os.sendfile` only copies from a file to a socket.
+"""
+import io
+import os
+from contextlib import contextmanager
+
+from tiktok_marketing.deadline import check_deadline
+
+
+def is_path(file) -> bool:
+    return isinstance(file, (str, os.PathLike))
+
+
+def get_position(file):
+    """This method returns where a seekable file object starts being written, None for paths and streams."""
+    if is_path(file) or not (hasattr(file, "seekable") and file.seekable()):
+        return None
+    return file.tell()
+
+
+def rewind(file, position) -> None:
+    """This method drops what a failed attempt wrote to a file object, paths are reopened by the next attempt."""
+    if position is not None:
+        file.seek(position)
+        file.truncate()
+
+
+def get_resume_offset(file, resume: bool) -> int:
+    """This method returns the size of a partial download to resume, 0 to start from scratch."""
+    if resume and is_path(file) and os.path.exists(file):
+        return os.path.getsize(file)
+    return 0
+
+
+def get_extension(file) -> str:
+    """This method returns the extension matching the content of a downloaded lead file, .zip or .csv."""
+    with open(file, "rb") as f:
+        return ".zip" if f.read(4) == b"PK\x03\x04" else ".csv"
+
+
+@contextmanager
+def open_destination(file, append: bool = False):
+    """This method opens a path for binary writing, file objects are used as they are."""
+    if not is_path(file):
+        yield file
+        return
+
+    with open(file, "ab" if append else "wb") as f:
+        yield f
+
+
+def write_chunks(chunks, file, append: bool = False) -> int:
+    """This method writes an iterable of bytes to a path or a binary file object, returns the bytes written."""
+    written = 0
+    with open_destination(file, append) as f:
+        for chunk in chunks:
+            check_deadline()
+            if chunk:
+                written += f.write(chunk)
+
+    return written
+
+
+async def awrite_chunks(chunks, file, append: bool = False) -> int:
+    """Same as `write_chunks` for an async iterable of bytes."""
+    written = 0
+    with open_destination(file, append) as f:
+        async for chunk in chunks:
+            check_deadline()
+            if chunk:
+                written += f.write(chunk)
+
+    return written
+
+
+def iter_csv_rows(file, encoding: str = "utf-8-sig"):
+    """
+    This generator yields the rows of a CSV file, or of the first CSV file of a zip archive, as dicts.
+    The file is read incrementally.
+
+    ## Parameters
+    - file: str, os.PathLike or binary file object
+    - encoding: str, optional, default: utf-8-sig
+    """
+    # only needed to read lead files, not to download them
+    import csv
+    import zipfile
+
+    with open_source(file) as source:
+        if zipfile.is_zipfile(source):
+            source.seek(0)
+            with zipfile.ZipFile(source) as archive:
+                name = next(name for name in archive.namelist() if not name.endswith("/"))
+                with archive.open(name) as member:
+                    yield from csv.DictReader(io.TextIOWrapper(member, encoding=encoding, newline=""))
+            return
+
+        source.seek(0)
+        text = io.TextIOWrapper(source, encoding=encoding, newline="")
+        try:
+            yield from csv.DictReader(text)
+        finally:
+            # don't close the caller's file object with the wrapper
+            text.detach()
+
+
+@contextmanager
+def open_source(file):
+    if not is_path(file):
+        yield file
+        return
+
+    with open(file, "rb") as f:
+        yield f
@@ -11,6 +11,8 @@ class BaseError(Exception):
     def __init__(self, message, response, *args, **kwargs):
         super().__init__(message, *args, **kwargs)
         self.response = response
+        self.code = None
+        self.attempts = []
 
 
 class BadRequestError(BaseError):
@@ -149,6 +151,14 @@ class EmptyFileError(BaseError):
     pass
 
 
+class TaskFailedError(BaseError):
+    pass
+
+
+class DeadlineExceededError(BaseError, TimeoutError):
+    pass
+
+
 class ExceptionFactory:
     mapping = {
         400: BadRequestError,
@@ -193,4 +203,6 @@ class ExceptionFactory:
 
     def get_exception(self, code, message, response):
         exception = self.mapping.get(code, UnknownError)
-        return exception(message, response)
+        error = exception(message, response)
+        error.code = code
+        return error
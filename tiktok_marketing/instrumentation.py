@@ -0,0 +1,184 @@
+"""
+Request instrumentation.
+
+Hooks are callables that receive a RequestEvent for every request, retry and throttling error.
+`MetricsCollector` is a hook that aggregates counters and latency histograms per endpoint.
+
+## Example
+
+    metrics = MetricsCollector()
+    client = TikTokClient(app_id, secret, hooks=[metrics])
+    ...
+    print(metrics.to_prometheus())
+"""
+import bisect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RequestEvent:
+    """
+    ## Attributes
+    - type: str
+        - "request" after every HTTP request, "retry" before a retry, "throttle" on a throttling error.
+    - endpoint, method, url: str
+    - status_code: int
+        - HTTP status.
+    - code: int
+        - TikTok code of the response body.
+    - request_id: str
+        - TikTok request id, useful when contacting support.
+    - request_bytes, response_bytes: int
+    - timings: dict, seconds
+        - total: from sending the request to the decoded response.
+        - response: until the response headers were received.
+        - rate_limit: time spent waiting for the rate limiter.
+        - connect and tls: connection setup, only reported by AsyncClient, 0 for reused connections.
+    - attempt: int
+        - attempt number, starting at 1.
+    - backoff: float
+        - seconds before the retry, for retry events.
+    - error: Exception
+    """
+
+    __slots__ = (
+        "type",
+        "endpoint",
+        "method",
+        "url",
+        "status_code",
+        "code",
+        "request_id",
+        "request_bytes",
+        "response_bytes",
+        "timings",
+        "attempt",
+        "backoff",
+        "error",
+    )
+
+    def __init__(self, type: str, endpoint: str, method: str, url: str, **kwargs) -> None:
+        self.type = type
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.status_code = kwargs.get("status_code")
+        self.code = kwargs.get("code")
+        self.request_id = kwargs.get("request_id")
+        self.request_bytes = kwargs.get("request_bytes", 0)
+        self.response_bytes = kwargs.get("response_bytes", 0)
+        self.timings = kwargs.get("timings", {})
+        self.attempt = kwargs.get("attempt", 1)
+        self.backoff = kwargs.get("backoff")
+        self.error = kwargs.get("error")
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"RequestEvent({self.type!r}, {self.endpoint!r}, status_code={self.status_code}, code={self.code})"
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets, in seconds."""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: tuple = BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def as_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return dict(buckets=buckets, sum=self.sum, count=self.count)
+
+
+class MetricsCollector:
+    """
+    Hook that aggregates per endpoint metrics:
+    requests, errors by code, retries, throttles, bytes sent and received, and latency histograms.
+    """
+
+    def __init__(self, buckets: tuple = Histogram.BUCKETS) -> None:
+        self.buckets = buckets
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self.lock:
+            metrics = self.endpoints.get(event.endpoint)
+            if metrics is None:
+                metrics = self.endpoints[event.endpoint] = dict(
+                    requests=0,
+                    errors={},
+                    retries=0,
+                    throttles=0,
+                    request_bytes=0,
+                    response_bytes=0,
+                    latency=Histogram(self.buckets),
+                )
+
+            if event.type == "retry":
+                metrics["retries"] += 1
+            elif event.type == "throttle":
+                metrics["throttles"] += 1
+            elif event.type == "request":
+                metrics["requests"] += 1
+                metrics["request_bytes"] += event.request_bytes or 0
+                metrics["response_bytes"] += event.response_bytes or 0
+                if "total" in event.timings:
+                    metrics["latency"].observe(event.timings["total"])
+                if event.error is not None:
+                    code = event.code or event.status_code or type(event.error).__name__
+                    metrics["errors"][code] = metrics["errors"].get(code, 0) + 1
+
+    def snapshot(self) -> dict:
+        """This method returns a copy of the metrics of every endpoint."""
+        with self.lock:
+            return {
+                endpoint: dict(metrics, errors=dict(metrics["errors"]), latency=metrics["latency"].as_dict())
+                for endpoint, metrics in self.endpoints.items()
+            }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.endpoints = {}
+
+    def to_prometheus(self, prefix: str = "tiktok_api") -> str:
+        """This method returns the metrics in the Prometheus text exposition format."""
+        lines = []
+        for endpoint, metrics in sorted(self.snapshot().items()):
+            label = f'endpoint="{endpoint}"'
+            for name in ("requests", "retries", "throttles", "request_bytes", "response_bytes"):
+                lines.append(f"{prefix}_{name}_total{{{label}}} {metrics[name]}")
+            for code, count in sorted(metrics["errors"].items(), key=str):
+                lines.append(f'{prefix}_errors_total{{{label},code="{code}"}} {count}')
+            latency = metrics["latency"]
+            for bound, count in latency["buckets"].items():
+                le = "+Inf" if bound == float("inf") else bound
+                lines.append(f'{prefix}_latency_seconds_bucket{{{label},le="{le}"}} {count}')
+            lines.append(f"{prefix}_latency_seconds_sum{{{label}}} {latency['sum']}")
+            lines.append(f"{prefix}_latency_seconds_count{{{label}}} {latency['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def emit(hooks: list, event: RequestEvent) -> None:
+    """This method calls every hook, a failing hook never breaks the request."""
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("Request hook failed")
@@ -0,0 +1,64 @@
+"""
+Pluggable JSON encoding and decoding.
+
+orjson is used when it's installed, then ujson, then the standard library.
+Every backend decodes bytes directly and encodes to bytes.
+"""
+import json
+
+
+class JSONBackend:
+    def __init__(self, name: str, loads, dumps) -> None:
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"JSONBackend({self.name!r})"
+
+
+def load_orjson() -> JSONBackend:
+    import orjson
+
+    return JSONBackend("orjson", orjson.loads, orjson.dumps)
+
+
+def load_ujson() -> JSONBackend:
+    import ujson
+
+    return JSONBackend("ujson", ujson.loads, lambda obj: ujson.dumps(obj, ensure_ascii=False).encode())
+
+
+def load_json() -> JSONBackend:
+    return JSONBackend("json", json.loads, lambda obj: json.dumps(obj, ensure_ascii=False).encode())
+
+
+BACKENDS = {
+    "orjson": load_orjson,
+    "ujson": load_ujson,
+    "json": load_json,
+}
+
+
+def get_backend(name: str = None) -> JSONBackend:
+    """
+    This method returns a JSON backend.
+
+    ## Parameters
+    - name: str, optional
+        - one of orjson, ujson or json, by default the fastest installed backend.
+        An ImportError is raised if the requested backend is not installed.
+    """
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError(f"Invalid JSON backend {name!r}, options: {', '.join(BACKENDS)}")
+        return BACKENDS[name]()
+
+    for load in BACKENDS.values():
+        try:
+            return load()
+        except ImportError:
+            continue
+
+
+default_backend = get_backend()
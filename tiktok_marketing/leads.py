@@ -1,5 +1,59 @@
-from os import access
+import asyncio
+import os
+import time
+from tiktok_marketing.batch import BatchResult
+from tiktok_marketing.batch import BulkOutcome
+from tiktok_marketing.batch import BulkSummary
+from tiktok_marketing.batch import aiter_concurrently
+from tiktok_marketing.batch import amap_concurrently
+from tiktok_marketing.batch import iter_concurrently
+from tiktok_marketing.batch import map_concurrently
+from tiktok_marketing.deadline import cap_delay
+from tiktok_marketing.download import get_extension
+from tiktok_marketing.download import iter_csv_rows
+from tiktok_marketing.exceptions import TaskFailedError
 from tiktok_marketing.module import Module
+from tiktok_marketing.pagination import aiter_records
+from tiktok_marketing.pagination import iter_records
+from tiktok_marketing.records import LeadRecord
+from tiktok_marketing.records import SubscriptionRecord
+from tiktok_marketing.records import to_typed_page
+
+
+def subscription_key(callback_url, page_id=None, advertiser_id=None, library_id=None) -> tuple:
+    """This method returns the identity of a subscription, ids are compared as strings."""
+    return tuple(None if value is None else str(value) for value in (callback_url, page_id, advertiser_id, library_id))
+
+
+class ReconcileReport:
+    """
+    Plan and outcome of `Leads.reconcile_subscriptions`.
+
+    ## Attributes
+    - creates: list of dicts with callback_url, page_id, advertiser_id and library_id.
+    - cancels: list of the existing subscriptions to cancel.
+    - unchanged: int, desired subscriptions that already exist.
+    - dry_run: bool, when True nothing was applied.
+    - created, cancelled: BulkSummary of the applied changes.
+    """
+
+    def __init__(self, creates: list, cancels: list, unchanged: int, dry_run: bool) -> None:
+        self.creates = creates
+        self.cancels = cancels
+        self.unchanged = unchanged
+        self.dry_run = dry_run
+        self.created = BulkSummary()
+        self.cancelled = BulkSummary()
+
+    @property
+    def ok(self) -> bool:
+        return self.created.ok and self.cancelled.ok
+
+    def __repr__(self) -> str:
+        return (
+            f"ReconcileReport(creates={len(self.creates)}, cancels={len(self.cancels)}, "
+            f"unchanged={self.unchanged}, dry_run={self.dry_run}, created={self.created}, cancelled={self.cancelled})"
+        )
 
 
 class Leads(Module):
@@ -18,12 +72,14 @@ class Leads(Module):
 
     - Create lead download task
     - Download leads
+    - Download leads of many forms
 
     ### Subscribing to leads
 
     - Subscribe to leads
     - Get subscriptions
     - Cancel subscription
+    - Reconcile subscriptions
 
     ### Leads migration
 
@@ -36,6 +92,7 @@ class Leads(Module):
         page_id: int,
         advertiser_id: int = None,
         library_id: int = None,
+        typed: bool = False,
     ) -> dict:
         """
         ## Reference
@@ -51,6 +108,8 @@ class Leads(Module):
         - library_id: number, conditional
             - If the instant form and the generated leads are under a Business Center,
             you must specify the ID of the form library that contains the instant form and leads.
+        - typed: bool, optional, default: False
+            - Return a compact `records.LeadRecord` instead of a dict.
 
         ## Returns
         - dict with the following keys:
@@ -76,6 +135,8 @@ class Leads(Module):
         else:
             raise ValueError("Either advertiser_id or library_id must be specified.")
 
+        if typed:
+            return self.transform(self.client.post(endpoint, data), LeadRecord)
         return self.client.post(endpoint, data)
 
     def get_test_leads(
@@ -128,6 +189,116 @@ class Leads(Module):
 
         return self.client.post(endpoint, data)
 
+    def create_test_leads(self, items, advertiser_id=None, library_id=None, max_workers: int = 8):
+        """
+        This method creates many test leads concurrently, see `iter_create_test_leads`.
+
+        ## Returns
+        - BulkSummary with the created leads in `succeeded` and the failures in `failed`.
+
+        With AsyncClient an awaitable is returned.
+        """
+        if self.client.is_async:
+            return self._asummarize(self.aiter_create_test_leads(items, advertiser_id, library_id, max_workers))
+        return self._summarize(self.iter_create_test_leads(items, advertiser_id, library_id, max_workers))
+
+    def iter_create_test_leads(self, items, advertiser_id=None, library_id=None, max_workers: int = 8):
+        """
+        This generator creates many test leads concurrently and yields a `BulkOutcome` per item
+        as the calls complete. A failing item doesn't stop the others, its exception is in `outcome.error`.
+        Calls go through the client so its rate limiter and retry policy apply.
+
+        ## Parameters
+        - items: iterable, required
+            - page ids, (page_id, advertiser_id, library_id) tuples or dicts with those keys.
+        - advertiser_id, library_id: number, optional
+            - used for the items that don't have them.
+        - max_workers: number, optional, default: 8
+            - Maximum number of calls at the same time.
+
+        ## Example
+
+            summary = BulkSummary()
+            for outcome in client.leads.iter_create_test_leads(page_ids, advertiser_id=advertiser_id):
+                summary.add(outcome)
+        """
+        items = self._bulk_items(items, "page_id", advertiser_id, library_id)
+        for index, result, error in iter_concurrently(self._create_test_lead, items, max_workers=max_workers):
+            yield BulkOutcome(items[index], result, error)
+
+    async def aiter_create_test_leads(self, items, advertiser_id=None, library_id=None, max_workers: int = 8):
+        """Same as `iter_create_test_leads` for AsyncClient, an async generator."""
+        items = self._bulk_items(items, "page_id", advertiser_id, library_id)
+        async for index, result, error in aiter_concurrently(self._create_test_lead, items, max_workers=max_workers):
+            yield BulkOutcome(items[index], result, error)
+
+    def delete_test_leads(self, items, advertiser_id=None, library_id=None, max_workers: int = 8):
+        """
+        This method deletes many test leads concurrently, see `iter_delete_test_leads`.
+
+        ## Returns
+        - BulkSummary with the deleted leads in `succeeded` and the failures in `failed`.
+
+        With AsyncClient an awaitable is returned.
+        """
+        if self.client.is_async:
+            return self._asummarize(self.aiter_delete_test_leads(items, advertiser_id, library_id, max_workers))
+        return self._summarize(self.iter_delete_test_leads(items, advertiser_id, library_id, max_workers))
+
+    def iter_delete_test_leads(self, items, advertiser_id=None, library_id=None, max_workers: int = 8):
+        """
+        This generator deletes many test leads concurrently and yields a `BulkOutcome` per item
+        as the calls complete, like `iter_create_test_leads`.
+
+        ## Parameters
+        - items: iterable, required
+            - lead ids, (lead_id, advertiser_id, library_id) tuples or dicts with those keys.
+
+        Other parameters are the same as `iter_create_test_leads`.
+        """
+        items = self._bulk_items(items, "lead_id", advertiser_id, library_id)
+        for index, result, error in iter_concurrently(self._delete_test_lead, items, max_workers=max_workers):
+            yield BulkOutcome(items[index], result, error)
+
+    async def aiter_delete_test_leads(self, items, advertiser_id=None, library_id=None, max_workers: int = 8):
+        """Same as `iter_delete_test_leads` for AsyncClient, an async generator."""
+        items = self._bulk_items(items, "lead_id", advertiser_id, library_id)
+        async for index, result, error in aiter_concurrently(self._delete_test_lead, items, max_workers=max_workers):
+            yield BulkOutcome(items[index], result, error)
+
+    def _bulk_items(self, items, key: str, advertiser_id, library_id) -> list:
+        """Normalizes the items of a bulk call to dicts of key, advertiser_id and library_id."""
+        normalized = []
+        for item in items:
+            if isinstance(item, dict):
+                item = dict(item)
+            elif isinstance(item, (tuple, list)):
+                item = dict(zip((key, "advertiser_id", "library_id"), item))
+            else:
+                item = {key: item}
+            if item.get("advertiser_id") is None and item.get("library_id") is None:
+                item.update(advertiser_id=advertiser_id, library_id=library_id)
+            normalized.append(item)
+        return normalized
+
+    def _create_test_lead(self, item: dict):
+        return self.create_test_lead(item["page_id"], item.get("advertiser_id"), item.get("library_id"))
+
+    def _delete_test_lead(self, item: dict):
+        return self.delete_test_lead(item["lead_id"], item.get("advertiser_id"), item.get("library_id"))
+
+    def _summarize(self, outcomes) -> BulkSummary:
+        summary = BulkSummary()
+        for outcome in outcomes:
+            summary.add(outcome)
+        return summary
+
+    async def _asummarize(self, outcomes) -> BulkSummary:
+        summary = BulkSummary()
+        async for outcome in outcomes:
+            summary.add(outcome)
+        return summary
+
     def create_lead_download_task(
         self,
         advertiser_id=None,
@@ -137,26 +308,260 @@ class Leads(Module):
         task_id=None,
     ) -> dict:
         """
+        This method creates a lead download task, or returns the status of a task if task_id is given.
+
         ## Reference
 
         https://ads.tiktok.com/marketing_api/docs?id=1701890942344193
+
+        ## Parameters
+        - advertiser_id: number, conditional
+            - If the leads are under an ad account, you must specify the advertiser ID.
+        - library_id: number, conditional
+            - If the leads are under a Business Center, you must specify the ID of the form library.
+        - ad_id: number, conditional
+            - The ID of the ad whose leads are downloaded.
+        - page_id: number, conditional
+            - The ID of the instant form whose leads are downloaded.
+        - task_id: number, optional
+            - The ID of a task created beforehand to get its status.
+
+        ## Returns
+        - dict with the following keys:
+            - task_id: number
+            - status: string, one of CREATED, RUNNING, SUCCEED, FAILED
         """
-        # endpoint = self.client.build_url("pages/leads/task/")
-        raise NotImplementedError("Not implemented yet.")
+        endpoint = self.client.build_url("pages/leads/task/")
+        params = dict()
+        if advertiser_id is not None:
+            params.update(advertiser_id=advertiser_id)
+        elif library_id is not None:
+            params.update(library_id=library_id)
+        else:
+            raise ValueError("Either advertiser_id or library_id must be specified.")
+
+        if task_id is not None:
+            params.update(task_id=task_id)
+            return self.client.get(endpoint, params=params)
+
+        if ad_id is not None:
+            params.update(ad_id=ad_id)
+        elif page_id is not None:
+            params.update(page_id=page_id)
+        else:
+            raise ValueError("Either ad_id, page_id or task_id must be specified.")
+
+        # a retried call would create another task
+        return self.client.get(endpoint, params=params, idempotent=False)
+
+    def download_leads_bulk(
+        self,
+        page_ids: list = None,
+        ad_ids: list = None,
+        advertiser_id: int = None,
+        library_id: int = None,
+        directory: str = ".",
+        max_workers: int = 4,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        task_timeout: float = 900.0,
+    ) -> BatchResult:
+        """
+        This method downloads the leads of many instant forms or ads.
+        Every form goes through create task -> poll status -> download on its own,
+        so each download starts as soon as its task is ready.
+
+        ## Parameters
+        - page_ids: list, conditional
+            - IDs of the instant forms.
+        - ad_ids: list, conditional
+            - IDs of the ads.
+        - advertiser_id: number, conditional
+        - library_id: number, conditional
+        - directory: str, optional, default: "."
+            - Lead files are saved as `<directory>/page_<id>.csv` or `<directory>/ad_<id>.csv`,
+            with a .zip extension when the API returns a zip archive. The directory is created if needed.
+        - max_workers: number, optional, default: 4
+            - Maximum number of forms processed at the same time.
+        - poll_interval: number, optional, default: 1
+            - Seconds before the first status check, the interval grows by 50% after every check.
+        - max_poll_interval: number, optional, default: 30
+        - task_timeout: number, optional, default: 900
+            - Seconds to wait for a task before giving up on it.
+
+        ## Returns
+        - BatchResult, a list with one dict per form in order:
+            - page_id or ad_id: number
+            - task_id: number
+            - status: string, SUCCEED
+            - file: str
+            - size: number
+        - `errors`: dict of ("page_id" | "ad_id", id) -> exception for the forms that failed.
+        A failed task raises TaskFailedError and a task that isn't ready in time raises TimeoutError.
+
+        With AsyncClient an awaitable is returned.
+        """
+        if advertiser_id is None and library_id is None:
+            raise ValueError("Either advertiser_id or library_id must be specified.")
+
+        os.makedirs(directory, exist_ok=True)
+        forms = [("page_id", page_id) for page_id in page_ids or []]
+        forms += [("ad_id", ad_id) for ad_id in ad_ids or []]
+        owner = dict(advertiser_id=advertiser_id, library_id=library_id)
+        options = dict(
+            directory=directory,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            task_timeout=task_timeout,
+        )
+
+        if self.client.is_async:
+            return self._adownload_leads_bulk(forms, owner, options, max_workers)
+
+        results, errors = map_concurrently(
+            lambda form: self._download_form_leads(form, owner, **options),
+            forms,
+            max_workers=max_workers,
+        )
+        return BatchResult(
+            [result for result in results if result is not None],
+            {forms[index]: error for index, error in errors.items()},
+        )
+
+    async def _adownload_leads_bulk(self, forms, owner, options, max_workers) -> BatchResult:
+        results, errors = await amap_concurrently(
+            lambda form: self._adownload_form_leads(form, owner, **options),
+            forms,
+            max_workers=max_workers,
+        )
+        return BatchResult(
+            [result for result in results if result is not None],
+            {forms[index]: error for index, error in errors.items()},
+        )
+
+    def _download_form_leads(
+        self,
+        form,
+        owner,
+        directory,
+        poll_interval,
+        max_poll_interval,
+        task_timeout,
+    ):
+        kind, form_id = form
+        task = self.create_lead_download_task(**owner, **{kind: form_id})
+        task_id = task["task_id"]
+        deadline = time.monotonic() + task_timeout
+        while self._check_task_status(task, task_id, deadline) != "SUCCEED":
+            time.sleep(cap_delay(poll_interval))
+            poll_interval = min(max_poll_interval, poll_interval * 1.5)
+            task = self.create_lead_download_task(**owner, task_id=task_id)
+
+        file = os.path.join(directory, f"{kind[:-3]}_{form_id}.csv")
+        size = self.download_leads(task_id, file=file, **owner)
+        file = self._rename_lead_file(file)
+        return {kind: form_id, "task_id": task_id, "status": "SUCCEED", "file": file, "size": size}
+
+    async def _adownload_form_leads(
+        self,
+        form,
+        owner,
+        directory,
+        poll_interval,
+        max_poll_interval,
+        task_timeout,
+    ):
+        kind, form_id = form
+        task = await self.create_lead_download_task(**owner, **{kind: form_id})
+        task_id = task["task_id"]
+        deadline = time.monotonic() + task_timeout
+        while self._check_task_status(task, task_id, deadline) != "SUCCEED":
+            await asyncio.sleep(cap_delay(poll_interval))
+            poll_interval = min(max_poll_interval, poll_interval * 1.5)
+            task = await self.create_lead_download_task(**owner, task_id=task_id)
+
+        file = os.path.join(directory, f"{kind[:-3]}_{form_id}.csv")
+        size = await self.download_leads(task_id, file=file, **owner)
+        file = self._rename_lead_file(file)
+        return {kind: form_id, "task_id": task_id, "status": "SUCCEED", "file": file, "size": size}
+
+    def _rename_lead_file(self, file: str) -> str:
+        extension = get_extension(file)
+        if extension == ".csv":
+            return file
+
+        renamed = file[: -len(".csv")] + extension
+        os.replace(file, renamed)
+        return renamed
+
+    def _check_task_status(self, task: dict, task_id, deadline: float) -> str:
+        status = task.get("status")
+        if status == "FAILED":
+            raise TaskFailedError(f"Lead download task {task_id} failed.", task)
+        if status != "SUCCEED" and time.monotonic() >= deadline:
+            raise TimeoutError(f"Lead download task {task_id} is not ready, status: {status}.")
+        return status
 
     def download_leads(
         self,
         task_id: int,
         advertiser_id: int = None,
         library_id: int = None,
-    ) -> dict:
+        file=None,
+        chunk_size: int = 1024 * 1024,
+        resume: bool = False,
+    ):
         """
+        This method downloads the lead file of a finished download task.
+        The file is streamed in chunks straight to `file`.
+
         ## Reference
 
         https://ads.tiktok.com/marketing_api/docs?id=1709486183758850
+
+        ## Parameters
+        - task_id: number, required
+            - The ID of the download task, see `create_lead_download_task`.
+        - advertiser_id: number, conditional
+            - If the leads are under an ad account, you must specify the advertiser ID.
+        - library_id: number, conditional
+            - If the leads are under a Business Center, you must specify the ID of the form library.
+        - file: str, os.PathLike or binary file object, required
+            - Destination of the lead file.
+        - chunk_size: number, optional, default: 1 MiB
+        - resume: bool, optional, default: False
+            - If file is a path to an interrupted download, only download the missing bytes.
+
+        ## Returns
+        - int, the size of the file.
+        With AsyncClient an awaitable is returned.
+
+        Use `iter_leads` to read the rows of the file.
         """
-        # endpoint = self.client.build_url("pages/leads/task/download/")
-        raise NotImplementedError("Not implemented yet.")
+        if file is None:
+            raise ValueError("file must be specified.")
+
+        endpoint = self.client.build_url("pages/leads/task/download/")
+        params = dict(task_id=task_id)
+        if advertiser_id is not None:
+            params.update(advertiser_id=advertiser_id)
+        elif library_id is not None:
+            params.update(library_id=library_id)
+        else:
+            raise ValueError("Either advertiser_id or library_id must be specified.")
+
+        return self.client.download(endpoint, file, params=params, chunk_size=chunk_size, resume=resume)
+
+    def iter_leads(self, file, encoding: str = "utf-8-sig"):
+        """
+        This generator yields the leads of a downloaded lead file one row at a time as dicts.
+        The file is parsed incrementally, CSV files and zip archives with a CSV file are supported.
+
+        ## Parameters
+        - file: str, os.PathLike or binary file object
+        - encoding: str, optional, default: utf-8-sig
+        """
+        return iter_csv_rows(file, encoding=encoding)
 
     def subscribe_to_leads(
         self,
@@ -211,17 +616,68 @@ class Leads(Module):
 
         return self.client.post(endpoint, data)
 
-    def get_subscriptions(self, page: int, page_size: int = 10) -> dict:
+    def get_subscriptions(self, page: int, page_size: int = 10, typed: bool = False) -> dict:
         """
         ## Reference
 
         https://ads.tiktok.com/marketing_api/docs?id=1709486516846593
+
+        ## Parameters
+        - page: number, required
+        - page_size: number, optional, default: 10
+        - typed: bool, optional, default: False
+            - Return the subscriptions as compact `records.SubscriptionRecord` objects.
         """
         endpoint = self.client.build_url("subscription/get/")
         data = self.client.build_app_data()
         data.update(object="LEAD", page=page, page_size=page_size)
+        if typed:
+            return self.transform(self.client.post(endpoint, data), self._to_typed_subscriptions)
         return self.client.post(endpoint, data)
 
+    def _to_typed_subscriptions(self, data: dict) -> dict:
+        return to_typed_page(data, SubscriptionRecord, items_key="subscriptions")
+
+    def iter_subscriptions(
+        self,
+        page_size: int = 10,
+        page: int = 1,
+        prefetch: bool = True,
+        typed: bool = False,
+    ):
+        """
+        This generator yields the lead subscriptions of every page one at a time.
+        The next page is fetched in the background while the current one is consumed.
+
+        ## Parameters
+        - page_size: number, optional, default: 10
+        - page: number, optional, default: 1
+            - The first page to fetch.
+        - prefetch: bool, optional, default: True
+            - Disable to only request a page once its first record is needed.
+        - typed: bool, optional, default: False
+            - Yield compact `records.SubscriptionRecord` objects.
+        """
+
+        def fetch_page(page):
+            return self.get_subscriptions(page, page_size=page_size, typed=typed)
+
+        return iter_records(fetch_page, page=page, items_key="subscriptions", prefetch=prefetch)
+
+    def aiter_subscriptions(
+        self,
+        page_size: int = 10,
+        page: int = 1,
+        prefetch: bool = True,
+        typed: bool = False,
+    ):
+        """Same as `iter_subscriptions` for AsyncClient, returns an async generator."""
+
+        def fetch_page(page):
+            return self.get_subscriptions(page, page_size=page_size, typed=typed)
+
+        return aiter_records(fetch_page, page=page, items_key="subscriptions", prefetch=prefetch)
+
     def cancel_subscription(self, subscription_id: int) -> dict:
         """
         ## Reference
@@ -237,6 +693,116 @@ class Leads(Module):
         data.update(subscription_id=subscription_id)
         return self.client.post(endpoint, data)
 
+    def reconcile_subscriptions(
+        self,
+        desired,
+        managed_urls: list = None,
+        dry_run: bool = False,
+        max_workers: int = 8,
+        page_size: int = 100,
+    ):
+        """
+        This method makes the lead subscriptions match a desired set.
+
+        Every existing subscription is read with pagination and the minimal diff is computed:
+        desired subscriptions that don't exist are created, and existing subscriptions of the managed
+        callback URLs that aren't desired, or are duplicates, are cancelled. The changes are applied
+        concurrently, a failing change doesn't stop the others. Running it again is safe.
+
+        ## Parameters
+        - desired: iterable, required
+            - (callback_url, page_id, advertiser_id, library_id) tuples or dicts with those keys.
+        - managed_urls: list, optional
+            - Callback URLs whose subscriptions may be cancelled, by default the URLs of the desired set.
+            Subscriptions of other URLs are left untouched.
+        - dry_run: bool, optional, default: False
+            - Only compute the plan.
+        - max_workers: number, optional, default: 8
+            - Maximum number of changes applied at the same time.
+        - page_size: number, optional, default: 100
+
+        ## Returns
+        - ReconcileReport, with AsyncClient an awaitable.
+
+        ## Example
+
+            report = client.leads.reconcile_subscriptions(
+                [(callback_url, page_id, advertiser_id, None) for page_id in page_ids], dry_run=True
+            )
+            report.creates, report.cancels
+        """
+        if self.client.is_async:
+            return self._areconcile_subscriptions(desired, managed_urls, dry_run, max_workers, page_size)
+
+        desired = self._desired_subscriptions(desired)
+        existing = list(self.iter_subscriptions(page_size=page_size))
+        report = self._plan_subscriptions(desired, existing, managed_urls, dry_run)
+        if not dry_run:
+            changes = self._subscription_changes(report)
+            for index, result, error in iter_concurrently(self._apply_subscription_change, changes, max_workers):
+                self._record_subscription_change(report, changes[index], result, error)
+        return report
+
+    async def _areconcile_subscriptions(self, desired, managed_urls, dry_run, max_workers, page_size):
+        desired = self._desired_subscriptions(desired)
+        existing = [subscription async for subscription in self.aiter_subscriptions(page_size=page_size)]
+        report = self._plan_subscriptions(desired, existing, managed_urls, dry_run)
+        if not dry_run:
+            changes = self._subscription_changes(report)
+            async for index, result, error in aiter_concurrently(
+                self._apply_subscription_change, changes, max_workers
+            ):
+                self._record_subscription_change(report, changes[index], result, error)
+        return report
+
+    def _desired_subscriptions(self, desired) -> dict:
+        """Normalizes the desired subscriptions to key -> dict, repeated entries are dropped."""
+        fields = ("callback_url", "page_id", "advertiser_id", "library_id")
+        subscriptions = {}
+        for item in desired:
+            item = dict(item) if isinstance(item, dict) else dict(zip(fields, item))
+            item = {field: item.get(field) for field in fields}
+            if item["callback_url"] is None:
+                raise ValueError(f"Desired subscription without callback_url: {item!r}")
+            if item["advertiser_id"] is None and item["library_id"] is None:
+                raise ValueError(f"Either advertiser_id or library_id must be specified: {item!r}")
+            subscriptions.setdefault(subscription_key(**item), item)
+        return subscriptions
+
+    def _plan_subscriptions(self, desired: dict, existing: list, managed_urls, dry_run) -> ReconcileReport:
+        if managed_urls is None:
+            managed_urls = {item["callback_url"] for item in desired.values()}
+        managed_urls = {str(url) for url in managed_urls}
+
+        found = set()
+        cancels = []
+        for subscription in existing:
+            detail = subscription.get("subscription_detail") or {}
+            key = subscription_key(
+                subscription.get("url"), detail.get("page_id"), detail.get("advertiser_id"), detail.get("library_id")
+            )
+            if key in desired and key not in found:
+                found.add(key)
+            elif key[0] in managed_urls:
+                cancels.append(subscription)
+
+        creates = [item for key, item in desired.items() if key not in found]
+        return ReconcileReport(creates, cancels, len(found), dry_run)
+
+    def _subscription_changes(self, report: ReconcileReport) -> list:
+        return [("create", item) for item in report.creates] + [("cancel", item) for item in report.cancels]
+
+    def _apply_subscription_change(self, change: tuple):
+        action, item = change
+        if action == "create":
+            return self.subscribe_to_leads(**item)
+        return self.cancel_subscription(item["subscription_id"])
+
+    def _record_subscription_change(self, report: ReconcileReport, change: tuple, result, error) -> None:
+        action, item = change
+        summary = report.created if action == "create" else report.cancelled
+        summary.add(BulkOutcome(item, result, error))
+
     def get_from_libraries(self):
         """
         ## Reference
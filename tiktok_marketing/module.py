@@ -4,3 +4,15 @@ from tiktok_marketing.client import Client
 class Module:
     def __init__(self, client: Client) -> None:
         self.client = client
+
+    def transform(self, result, func):
+        """
+        This method applies func to the result of a client call.
+        With AsyncClient the result is awaited first and an awaitable is returned.
+        """
+        if self.client.is_async:
+            return self._atransform(result, func)
+        return func(result)
+
+    async def _atransform(self, result, func):
+        return func(await result)
@@ -1,5 +1,19 @@
 from datetime import datetime
+from tiktok_marketing.batch import BatchResult
+from tiktok_marketing.batch import amap_concurrently
+from tiktok_marketing.batch import map_concurrently
+from tiktok_marketing.columnar import Columns
+from tiktok_marketing.columnar import ato_columns
+from tiktok_marketing.columnar import to_columns
 from tiktok_marketing.module import Module
+from tiktok_marketing.pagination import aiter_records
+from tiktok_marketing.pagination import get_items
+from tiktok_marketing.pagination import get_total_page
+from tiktok_marketing.pagination import iter_records
+from tiktok_marketing.records import PageRecord
+from tiktok_marketing.records import to_typed_page
+from tiktok_marketing.store import EntityStore
+from tiktok_marketing.store import iter_chunks
 
 
 class Pages(Module):
@@ -31,6 +45,10 @@ class Pages(Module):
             - Instant Form title, will filter the form that **contains** the words in the title.
         - `business_type`: string, optional, default: LEAD_GEN
             - Instant page type，optional values: LEAD_GEN(InstantForm), STORE_FRONT(Storefront Page)
+        - `typed`: bool, optional, default: False
+            - Return the pages as compact `records.PageRecord` objects and page_info as `records.PageInfo`.
+        - `columnar`: bool, optional, default: False
+            - Return the pages as `columnar.Columns`, one typed column per field.
 
         ## Returns
         - dict with the following keys:
@@ -83,4 +101,230 @@ class Pages(Module):
         if business_type is not None and business_type in ["LEAD_GEN", "STORE_FRONT"]:
             params.update(business_type=business_type)
 
+        if kwargs.get("typed", False):
+            return self.transform(self.client.get(endpoint, params=params), self._to_typed_page)
+        if kwargs.get("columnar", False):
+            return self.transform(self.client.get(endpoint, params=params), self._to_columnar_page)
         return self.client.get(endpoint, params=params)
+
+    def _to_typed_page(self, data: dict) -> dict:
+        return to_typed_page(data, PageRecord)
+
+    def _to_columnar_page(self, data: dict) -> dict:
+        return dict(data, list=Columns.from_rows(get_items(data)))
+
+    def iter_pages(self, advertiser_id: int = None, library_id: int = None, prefetch: bool = True, **kwargs):
+        """
+        This generator yields the instant forms of every page one at a time.
+        The next page is fetched in the background while the current one is consumed.
+
+        ## Parameters
+        - `prefetch`: bool, optional, default: True
+            - Disable to only request a page once its first record is needed.
+
+        Other parameters are the same as `get_pages`, `page` is the first page to fetch,
+        with `typed=True` the pages are yielded as compact `records.PageRecord` objects.
+        With `columnar=True` every page is appended as it arrives to one `columnar.Columns`,
+        which is returned once the last page is read.
+
+        ## Example
+
+            for page in client.pages.iter_pages(advertiser_id=advertiser_id, status="PUBLISHED"):
+                ...
+        """
+        first_page, columnar, kwargs = self._pagination_kwargs(kwargs)
+
+        def fetch_page(page):
+            return self.get_pages(advertiser_id=advertiser_id, library_id=library_id, page=page, **kwargs)
+
+        records = iter_records(fetch_page, page=first_page, prefetch=prefetch)
+        return to_columns(records) if columnar else records
+
+    def aiter_pages(self, advertiser_id: int = None, library_id: int = None, prefetch: bool = True, **kwargs):
+        """
+        Same as `iter_pages` for AsyncClient, returns an async generator,
+        or an awaitable of `columnar.Columns` with `columnar=True`.
+
+        ## Example
+
+            async for page in client.pages.aiter_pages(advertiser_id=advertiser_id):
+                ...
+        """
+        first_page, columnar, kwargs = self._pagination_kwargs(kwargs)
+
+        def fetch_page(page):
+            return self.get_pages(advertiser_id=advertiser_id, library_id=library_id, page=page, **kwargs)
+
+        records = aiter_records(fetch_page, page=first_page, prefetch=prefetch)
+        return ato_columns(records) if columnar else records
+
+    def get_all_pages(
+        self,
+        advertiser_id: int = None,
+        library_id: int = None,
+        max_workers: int = 8,
+        **kwargs,
+    ) -> BatchResult:
+        """
+        This method returns the instant forms of every page.
+        The first page is fetched to read `page_info.total_page`,
+        then the remaining pages are fetched concurrently.
+
+        ## Parameters
+        - `max_workers`: number, optional, default: 8
+            - Maximum number of pages fetched at the same time.
+
+        Other parameters are the same as `get_pages`, `page` is the first page to fetch.
+
+        ## Returns
+        - BatchResult, a list with the records of every page in order.
+            - `errors`: dict of page number -> exception for the pages that failed,
+            the records of the other pages are kept.
+        - with `columnar=True`, one `columnar.Columns` with the records of every page and the same `errors`.
+
+        If the first page fails the exception is raised.
+        With AsyncClient an awaitable is returned.
+        """
+        if self.client.is_async:
+            return self._aget_all_pages(advertiser_id, library_id, max_workers, **kwargs)
+
+        first_page, columnar, kwargs = self._pagination_kwargs(kwargs)
+
+        def fetch_page(page):
+            return self.get_pages(advertiser_id=advertiser_id, library_id=library_id, page=page, **kwargs)
+
+        first = fetch_page(first_page)
+        pages = list(range(first_page + 1, get_total_page(first) + 1))
+        results, errors = map_concurrently(fetch_page, pages, max_workers=max_workers)
+        return self._merge_pages(first, pages, results, errors, columnar)
+
+    async def _aget_all_pages(self, advertiser_id, library_id, max_workers, **kwargs) -> BatchResult:
+        first_page, columnar, kwargs = self._pagination_kwargs(kwargs)
+
+        def fetch_page(page):
+            return self.get_pages(advertiser_id=advertiser_id, library_id=library_id, page=page, **kwargs)
+
+        first = await fetch_page(first_page)
+        pages = list(range(first_page + 1, get_total_page(first) + 1))
+        results, errors = await amap_concurrently(fetch_page, pages, max_workers=max_workers)
+        return self._merge_pages(first, pages, results, errors, columnar)
+
+    def iter_changed_pages(
+        self,
+        store: EntityStore,
+        advertiser_id: int = None,
+        library_id: int = None,
+        overlap: float = 300.0,
+        **kwargs,
+    ):
+        """
+        This generator yields the instant forms created or updated since the last successful sync.
+
+        The watermark of the advertiser or library is kept in the store. Only pages updated after
+        the watermark minus `overlap` seconds are requested, and pages whose stored copy is identical
+        are skipped, so every new or changed page is yielded once.
+        Changed pages are staged in a temporary table of the store as they are yielded, so memory
+        stays constant. When the generator is exhausted they are merged into the store together
+        with the new watermark in one transaction. If the sync fails or stops early nothing is
+        written and the next sync starts from the same watermark.
+
+        ## Parameters
+        - `store`: `store.EntityStore`
+        - `overlap`: number, optional, default: 300
+            - Seconds re-read before the watermark, for pages updated while the previous sync ran.
+
+        Other parameters are the same as `iter_pages`, the first sync reads the whole history.
+
+        ## Example
+
+            store = EntityStore("tiktok.db")
+            for page in client.pages.iter_changed_pages(store, advertiser_id=advertiser_id):
+                ...
+        """
+        scope, kwargs = self._sync_kwargs(store, advertiser_id, library_id, overlap, kwargs)
+        staging = store.create_staging("pages")
+        try:
+            for chunk in iter_chunks(self.iter_pages(advertiser_id, library_id, **kwargs), 500):
+                yield from self._stage_changed(store, staging, chunk, advertiser_id, library_id)
+            self._commit_sync(store, scope, staging, kwargs["end"])
+        finally:
+            store.drop_staging(staging)
+
+    async def aiter_changed_pages(
+        self,
+        store: EntityStore,
+        advertiser_id: int = None,
+        library_id: int = None,
+        overlap: float = 300.0,
+        **kwargs,
+    ):
+        """Same as `iter_changed_pages` for AsyncClient, an async generator."""
+        scope, kwargs = self._sync_kwargs(store, advertiser_id, library_id, overlap, kwargs)
+        staging = store.create_staging("pages")
+        try:
+            chunk = []
+            async for page in self.aiter_pages(advertiser_id, library_id, **kwargs):
+                chunk.append(page)
+                if len(chunk) < 500:
+                    continue
+                for page in self._stage_changed(store, staging, chunk, advertiser_id, library_id):
+                    yield page
+                chunk = []
+            for page in self._stage_changed(store, staging, chunk, advertiser_id, library_id):
+                yield page
+            self._commit_sync(store, scope, staging, kwargs["end"])
+        finally:
+            store.drop_staging(staging)
+
+    def get_sync_scope(self, advertiser_id: int = None, library_id: int = None, **filters) -> str:
+        """This method returns the watermark key of a sync, the filters are part of it."""
+        if advertiser_id is not None:
+            scope = f"pages:advertiser_id={advertiser_id}"
+        elif library_id is not None:
+            scope = f"pages:library_id={library_id}"
+        else:
+            raise ValueError("Either advertiser_id or library_id must be specified.")
+        for key in ("status", "title", "business_type"):
+            if filters.get(key) is not None:
+                scope += f":{key}={filters[key]}"
+        return scope
+
+    def _sync_kwargs(self, store, advertiser_id, library_id, overlap, kwargs):
+        kwargs = dict(kwargs)
+        kwargs.pop("typed", None)
+        kwargs.pop("columnar", None)
+        scope = self.get_sync_scope(advertiser_id, library_id, **kwargs)
+        watermark = store.get_watermark(scope)
+        if watermark is not None:
+            kwargs["start"] = max(0.0, watermark - overlap)
+        kwargs.setdefault("end", datetime.now().timestamp())
+        return scope, kwargs
+
+    def _stage_changed(self, store, staging, chunk, advertiser_id, library_id) -> list:
+        changed = store.filter_changed("pages", chunk, staging)
+        store.stage(staging, "pages", changed, **store.build_scope(advertiser_id, library_id))
+        return changed
+
+    def _commit_sync(self, store, scope, staging, end) -> None:
+        with store.transaction():
+            store.merge_staging(staging, "pages")
+            store.set_watermark(scope, end)
+
+    def _merge_pages(self, first: dict, pages: list, results: list, errors: dict, columnar: bool = False):
+        merged = Columns() if columnar else BatchResult()
+        merged.extend(get_items(first))
+        for data in results:
+            if data is not None:
+                merged.extend(get_items(data))
+
+        merged.errors = {pages[index]: error for index, error in errors.items()}
+        return merged
+
+    def _pagination_kwargs(self, kwargs: dict):
+        """
+        Pins the `end` of the time range so every page is read from the same snapshot.
+        `columnar` is taken out, pages are fetched as records and appended to one `Columns` instead.
+        """
+        kwargs = dict(kwargs)
+        kwargs.setdefault("end", datetime.now().timestamp())
+        return kwargs.pop("page", 1), kwargs.pop("columnar", False), kwargs
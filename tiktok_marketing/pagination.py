@@ -0,0 +1,94 @@
+"""
+Helpers to walk paginated endpoints.
+
+Paginated endpoints return a dict with a `page_info` object and a list of records:
+{
+    "page_info": {"page": 1, "page_size": 10, "total_number": 25, "total_page": 3},
+    "list": [...]
+}
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from tiktok_marketing.deadline import run_in_context
+
+
+def get_items(data: dict, items_key: str = "list") -> list:
+    """This method returns the records of a page, falling back to the `list` key."""
+    if items_key in data:
+        return data[items_key] or []
+    return data.get("list") or []
+
+
+def get_total_page(data: dict) -> int:
+    """This method returns page_info.total_page, 1 when it's missing."""
+    page_info = data.get("page_info") or {}
+    return int(page_info.get("total_page", 1) or 1)
+
+
+def iter_records(fetch_page, page: int = 1, items_key: str = "list", prefetch: bool = True):
+    """
+    This generator yields the records of every page one at a time.
+
+    ## Parameters
+    - fetch_page: callable
+        - receives the page number and returns the page data.
+    - page: int, optional, default: 1
+        - first page to fetch.
+    - items_key: str, optional, default: "list"
+        - key of the records in the page data.
+    - prefetch: bool, optional, default: True
+        - fetch page N+1 in a background thread while page N is consumed.
+        At most one page that is never read will be requested if the consumer stops early.
+    """
+    if not prefetch:
+        while True:
+            data = fetch_page(page)
+            yield from get_items(data, items_key)
+            if page >= get_total_page(data):
+                return
+            page += 1
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = run_in_context(executor, fetch_page, page)
+    try:
+        while future is not None:
+            data = future.result()
+            future = None
+            if page < get_total_page(data):
+                page += 1
+                future = run_in_context(executor, fetch_page, page)
+            yield from get_items(data, items_key)
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_records(fetch_page, page: int = 1, items_key: str = "list", prefetch: bool = True):
+    """
+    This async generator yields the records of every page one at a time.
+    Same as `iter_records` but `fetch_page` returns an awaitable and prefetching runs as a task.
+    """
+    if not prefetch:
+        while True:
+            data = await fetch_page(page)
+            for item in get_items(data, items_key):
+                yield item
+            if page >= get_total_page(data):
+                return
+            page += 1
+
+    task = asyncio.ensure_future(fetch_page(page))
+    try:
+        while task is not None:
+            data = await task
+            task = None
+            if page < get_total_page(data):
+                page += 1
+                task = asyncio.ensure_future(fetch_page(page))
+            for item in get_items(data, items_key):
+                yield item
+    finally:
+        if task is not None:
+            task.cancel()
@@ -0,0 +1,155 @@
+"""
+Client side rate limiting.
+
+TikTok throttles with HTTP 429 or code 40100, both are mapped to TooManyRequestsError.
+The limiter keeps a token bucket per key, slows a bucket down when throttling errors come back
+and ramps it back up to the configured rate while calls succeed.
+
+A limiter is thread safe and can be shared by sync and async clients of the same process.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from tiktok_marketing.deadline import cap_delay
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations, callers wait until their token is available.
+
+    ## Parameters
+    - rate: float
+        - tokens added per second.
+    - capacity: float
+        - maximum number of tokens, the size of a burst.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """This method takes a token and returns the seconds to wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.rate = rate
+
+    def drain(self) -> None:
+        """This method empties the bucket so pending callers don't burst after a throttling error."""
+        with self.lock:
+            self.tokens = min(self.tokens, 0)
+            self.updated_at = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Adaptive rate limiter keyed by app_id, access token and/or endpoint.
+
+    ## Parameters
+    - rate: float, optional, default: 10
+        - calls per second allowed for every key.
+    - burst: float, optional, default: rate
+        - calls that can be made at once after being idle.
+    - key: tuple, optional, default: ("app_id",)
+        - parts of the key, any of "app_id", "access_token" and "endpoint".
+    - min_rate: float, optional, default: 0.5
+        - the rate never goes below this value when throttled.
+    - decrease_factor: float, optional, default: 0.5
+        - the rate is multiplied by this factor on every throttling error.
+    - increase_step: float, optional, default: rate / 20
+        - calls per second added back on every successful call.
+    - max_buckets: int, optional, default: 10000
+        - buckets kept, the least recently used one is dropped beyond that,
+        e.g. when the key has an access token per tenant.
+
+    ## Example
+
+        limiter = RateLimiter(rate=10, key=("app_id", "endpoint"))
+        client = TikTokClient(app_id, secret, rate_limiter=limiter)
+    """
+
+    KEY_PARTS = ("app_id", "access_token", "endpoint")
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float = None,
+        key: tuple = ("app_id",),
+        min_rate: float = 0.5,
+        decrease_factor: float = 0.5,
+        increase_step: float = None,
+        max_buckets: int = 10000,
+    ) -> None:
+        for part in key:
+            if part not in self.KEY_PARTS:
+                raise ValueError(f"Invalid key part {part!r}, options: {', '.join(self.KEY_PARTS)}")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.key = tuple(key)
+        self.min_rate = min(min_rate, rate)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step if increase_step is not None else rate / 20
+        self.max_buckets = max_buckets
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def build_key(self, app_id: str = None, access_token: str = None, endpoint: str = None) -> tuple:
+        values = dict(app_id=app_id, access_token=access_token, endpoint=endpoint)
+        return tuple(values[part] for part in self.key)
+
+    def get_bucket(self, key: tuple) -> TokenBucket:
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(self.rate, self.burst)
+                while len(self.buckets) > self.max_buckets:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(key)
+            return bucket
+
+    def acquire(self, key: tuple) -> float:
+        """This method blocks until a call can be made, returns the seconds waited."""
+        wait = self.get_bucket(key).reserve()
+        if wait > 0:
+            time.sleep(cap_delay(wait))
+        return wait
+
+    async def acquire_async(self, key: tuple) -> float:
+        """Same as `acquire` without blocking the event loop."""
+        wait = self.get_bucket(key).reserve()
+        if wait > 0:
+            # asyncio is only imported by async callers, it's slow to import
+            import asyncio
+
+            await asyncio.sleep(cap_delay(wait))
+        return wait
+
+    def throttled(self, key: tuple) -> None:
+        """This method must be called when the API answers with a throttling error."""
+        bucket = self.get_bucket(key)
+        bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease_factor))
+        bucket.drain()
+
+    def succeeded(self, key: tuple) -> None:
+        """This method must be called after a successful call."""
+        bucket = self.get_bucket(key)
+        if bucket.rate < self.rate:
+            bucket.set_rate(min(self.rate, bucket.rate + self.increase_step))
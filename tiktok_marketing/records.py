@@ -0,0 +1,183 @@
+"""
+Compact record types for list responses.
+
+Records keep their fields in __slots__ instead of a per-object dict, which takes a fraction
+of the memory when hundreds of thousands of pages or leads are held at once.
+Nested objects such as `meta_data` are kept as they were received and only turned into
+records the first time they are accessed. `to_dict()` returns the original shape.
+Fields that are not declared are kept in `extra`.
+Low cardinality string fields, e.g. `status`, are interned so that every record shares the same string.
+Records compare equal when they have the same type and `to_dict()`. Like dicts they are mutable
+and unhashable, use a field such as `page_id` as the key of a set or dict.
+"""
+import sys
+
+
+class Record:
+    __slots__ = ("extra",)
+    FIELDS = ()
+    NESTED = {}
+    INTERNED = ()
+
+    def __init__(self, data: dict) -> None:
+        data = dict(data)
+        for field in self.FIELDS:
+            setattr(self, slot_name(self, field), data.pop(field, None))
+        for field in self.INTERNED:
+            value = getattr(self, field)
+            if type(value) is str:
+                setattr(self, field, sys.intern(value))
+        self.extra = data or None
+
+    @classmethod
+    def from_list(cls, items: list) -> list:
+        return [cls(item) for item in items]
+
+    def get(self, field: str, default=None):
+        if field in self.FIELDS:
+            value = getattr(self, field)
+            return default if value is None else value
+        if self.extra is not None:
+            return self.extra.get(field, default)
+        return default
+
+    def __getitem__(self, field: str):
+        if field in self.FIELDS:
+            return getattr(self, field)
+        if self.extra is not None and field in self.extra:
+            return self.extra[field]
+        raise KeyError(field)
+
+    def to_dict(self) -> dict:
+        """This method returns the record as a plain dict, nested records included."""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, slot_name(self, field))
+            if value is not None:
+                data[field] = value.to_dict() if isinstance(value, Record) else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    # mutable and holding dicts such as lead_data, a hash could change while the record is in a set
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def slot_name(record: Record, field: str) -> str:
+    return f"_{field}" if field in record.NESTED else field
+
+
+def nested_property(field: str, record_class: type) -> property:
+    slot = f"_{field}"
+
+    def getter(self):
+        value = getattr(self, slot)
+        if isinstance(value, dict):
+            value = record_class(value)
+            setattr(self, slot, value)
+        return value
+
+    def setter(self, value):
+        setattr(self, slot, value)
+
+    return property(getter, setter)
+
+
+def record_type(name: str, fields: tuple, nested: dict = None, interned: tuple = ()) -> type:
+    """
+    This method creates a Record subclass.
+
+    ## Parameters
+    - name: str
+    - fields: tuple
+        - names of the fields stored in slots.
+    - nested: dict, optional
+        - field -> Record subclass, those fields are converted on first access.
+    - interned: tuple, optional
+        - string fields with few distinct values.
+    """
+    nested = nested or {}
+    namespace = dict(
+        __slots__=tuple(f"_{field}" if field in nested else field for field in fields),
+        FIELDS=tuple(fields),
+        NESTED=nested,
+        INTERNED=tuple(interned),
+    )
+    for field, record_class in nested.items():
+        namespace[field] = nested_property(field, record_class)
+    return type(name, (Record,), namespace)
+
+
+PageInfo = record_type("PageInfo", ("page", "page_size", "total_number", "total_page"))
+
+PageRecord = record_type(
+    "PageRecord",
+    (
+        "page_id",
+        "status",
+        "title",
+        "duplicate_id",
+        "user_id",
+        "preview_url",
+        "thumbnail",
+        "create_time",
+        "update_time",
+        "publish_time",
+        "template_id",
+    ),
+    interned=("status", "preview_url", "thumbnail"),
+)
+
+LeadMetaData = record_type(
+    "LeadMetaData",
+    (
+        "lead_id",
+        "page_id",
+        "campaign_id",
+        "campaign_name",
+        "adgroup_id",
+        "adgroup_name",
+        "ad_id",
+        "ad_name",
+        "create_time",
+    ),
+    interned=("campaign_name", "adgroup_name", "ad_name"),
+)
+
+LeadRecord = record_type(
+    "LeadRecord",
+    ("request_id", "lead_data", "meta_data"),
+    nested=dict(meta_data=LeadMetaData),
+)
+
+SubscriptionDetail = record_type(
+    "SubscriptionDetail",
+    ("access_token", "advertiser_id", "library_id", "page_id"),
+)
+
+SubscriptionRecord = record_type(
+    "SubscriptionRecord",
+    ("subscription_id", "object", "url", "subscription_detail"),
+    nested=dict(subscription_detail=SubscriptionDetail),
+    interned=("object", "url"),
+)
+
+
+def to_typed_page(data: dict, record_class: type, items_key: str = "list") -> dict:
+    """This method returns a page of a list response with its records and page_info as records."""
+    data = dict(data)
+    if items_key not in data and "list" in data:
+        items_key = "list"
+    if items_key in data:
+        data[items_key] = record_class.from_list(data[items_key] or [])
+    if isinstance(data.get("page_info"), dict):
+        data["page_info"] = PageInfo(data["page_info"])
+    return data
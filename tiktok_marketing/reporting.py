@@ -0,0 +1,307 @@
+"""
+Reporting module.
+
+Report queries are limited to a date range per request, e.g. 30 days with the `stat_time_day`
+dimension and 1 day with `stat_time_hour`, and to one advertiser. `iter_report` splits a query
+over many advertisers and a long date range into shards that fit those limits, fetches the shards
+in parallel, paginates each of them and streams the rows as shards complete.
+"""
+from datetime import date
+from datetime import timedelta
+from tiktok_marketing.batch import aiter_concurrently
+from tiktok_marketing.batch import iter_concurrently
+from tiktok_marketing.columnar import ato_columns
+from tiktok_marketing.columnar import to_columns
+from tiktok_marketing.module import Module
+from tiktok_marketing.pagination import aiter_records
+from tiktok_marketing.pagination import iter_records
+
+
+class ReportShard:
+    """One advertiser and a date range small enough for a single report query."""
+
+    __slots__ = ("advertiser_id", "start_date", "end_date")
+
+    def __init__(self, advertiser_id, start_date: date = None, end_date: date = None) -> None:
+        self.advertiser_id = advertiser_id
+        self.start_date = start_date
+        self.end_date = end_date
+
+    @property
+    def key(self) -> tuple:
+        return (str(self.advertiser_id), self.start_date, self.end_date)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ReportShard) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"ReportShard({self.advertiser_id!r}, {self.start_date}, {self.end_date})"
+
+
+def to_date(value) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def split_date_range(start_date, end_date, max_days: int) -> list:
+    """
+    This method splits an inclusive date range into consecutive ranges of at most max_days days.
+
+    ## Returns
+    - list of (start_date, end_date) tuples of datetime.date
+    """
+    start_date, end_date = to_date(start_date), to_date(end_date)
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date.")
+    if max_days < 1:
+        raise ValueError("max_days must be at least 1.")
+
+    ranges = []
+    while start_date <= end_date:
+        window_end = min(end_date, start_date + timedelta(days=max_days - 1))
+        ranges.append((start_date, window_end))
+        start_date = window_end + timedelta(days=1)
+    return ranges
+
+
+class Reporting(Module):
+    # days per query, by time dimension
+    MAX_DAYS = {"stat_time_hour": 1, "stat_time_day": 30}
+    DEFAULT_MAX_DAYS = 30
+    MAX_PAGE_SIZE = 1000
+
+    def get_report(
+        self,
+        advertiser_id: int,
+        dimensions: list,
+        metrics: list = None,
+        start_date=None,
+        end_date=None,
+        report_type: str = "BASIC",
+        data_level: str = "AUCTION_AD",
+        **kwargs,
+    ):
+        """
+        This method returns a page of a synchronous report.
+
+        ## Reference
+
+        https://ads.tiktok.com/marketing_api/docs?id=1740302848100353
+
+        ## Parameters
+        - `advertiser_id`: number, required
+        - `dimensions`: list, required
+            - Grouping conditions, e.g. ["campaign_id", "stat_time_day"].
+        - `metrics`: list, optional, default: ["spend", "impressions"]
+        - `start_date`, `end_date`: str YYYY-MM-DD or datetime.date, required unless `lifetime` is True
+        - `report_type`: str, optional, default: BASIC
+            - Options: BASIC, AUDIENCE, PLAYABLE_MATERIAL, CATALOG
+        - `data_level`: str, optional, default: AUCTION_AD
+            - Options: AUCTION_AD, AUCTION_ADGROUP, AUCTION_CAMPAIGN, AUCTION_ADVERTISER
+
+        ## Keyword Arguments
+        - `page`: number, optional, default: 1
+        - `page_size`: number, optional, default: 1000
+        - `lifetime`: bool, optional, default: False
+            - Query the lifetime metrics, the dates are ignored.
+        - `filtering`: list, optional
+        - `order_field`: str, optional
+        - `order_type`: str, optional
+            - Options: ASC, DESC
+        - `service_type`: str, optional
+            - Options: AUCTION, RESERVATION
+
+        ## Returns
+        - dict with the following keys:
+            - page_info
+            - list:
+                - dimensions: dict
+                - metrics: dict
+        """
+        endpoint = self.client.build_url("reports/integrated/get/")
+        params = dict(
+            advertiser_id=advertiser_id,
+            report_type=report_type,
+            data_level=data_level,
+            dimensions=list(dimensions),
+            metrics=list(metrics or ["spend", "impressions"]),
+            page=kwargs.get("page", 1),
+            page_size=kwargs.get("page_size", self.MAX_PAGE_SIZE),
+        )
+        if kwargs.get("lifetime", False):
+            params.update(lifetime=True)
+        elif start_date is None or end_date is None:
+            raise ValueError("start_date and end_date must be specified unless lifetime is True.")
+        else:
+            params.update(start_date=to_date(start_date).isoformat(), end_date=to_date(end_date).isoformat())
+
+        for key in ("filtering", "order_field", "order_type", "service_type"):
+            if kwargs.get(key) is not None:
+                params[key] = kwargs[key]
+
+        return self.client.get(endpoint, params=params)
+
+    def get_max_days(self, dimensions: list) -> int:
+        """This method returns the number of days a single query can span with these dimensions."""
+        limits = [self.MAX_DAYS[dimension] for dimension in dimensions if dimension in self.MAX_DAYS]
+        return min(limits, default=self.DEFAULT_MAX_DAYS)
+
+    def build_shards(
+        self,
+        advertiser_ids: list,
+        dimensions: list,
+        start_date=None,
+        end_date=None,
+        max_days: int = None,
+        lifetime: bool = False,
+    ) -> list:
+        """
+        This method splits a report query into shards of one advertiser and a date range within the limits.
+        Repeated advertiser ids are only queried once.
+
+        ## Parameters
+        - `max_days`: number, optional
+            - Days per shard, by default the limit of the time dimension, see `MAX_DAYS`.
+        """
+        advertiser_ids = list(dict.fromkeys(advertiser_ids))
+        if lifetime:
+            return [ReportShard(advertiser_id) for advertiser_id in advertiser_ids]
+
+        if start_date is None or end_date is None:
+            raise ValueError("start_date and end_date must be specified unless lifetime is True.")
+        ranges = split_date_range(start_date, end_date, max_days or self.get_max_days(dimensions))
+        shards = [ReportShard(advertiser_id, start, end) for advertiser_id in advertiser_ids for start, end in ranges]
+        return list(dict.fromkeys(shards))
+
+    def iter_report(
+        self,
+        advertiser_ids: list,
+        dimensions: list,
+        metrics: list = None,
+        start_date=None,
+        end_date=None,
+        max_workers: int = 8,
+        max_days: int = None,
+        errors: dict = None,
+        **kwargs,
+    ):
+        """
+        This generator yields the rows of a report over many advertisers and a long date range.
+        The query is split with `build_shards`, up to max_workers shards are fetched at the same time,
+        every shard is paginated and its rows are yielded as soon as the shard completes.
+        Requests go through the client so its rate limiter, retry policy and single-flight apply.
+
+        ## Parameters
+        - `advertiser_ids`: list, required
+        - `max_workers`: number, optional, default: 8
+            - Maximum number of shards fetched at the same time.
+        - `max_days`: number, optional
+            - Days per shard, by default the limit of the time dimension.
+        - `errors`: dict, optional
+            - When given, the shards that fail are stored in it as shard -> exception and
+            the other shards are still yielded. By default the first failure is raised.
+
+        Other parameters are the same as `get_report`.
+        Rows are yielded in completion order, every row has an `advertiser_id` key.
+
+        ## Example
+
+            for row in client.reporting.iter_report(
+                advertiser_ids, ["campaign_id", "stat_time_day"], ["spend"], "2022-01-01", "2022-03-31"
+            ):
+                ...
+        """
+        shards = self.build_shards(
+            advertiser_ids, dimensions, start_date, end_date, max_days, kwargs.get("lifetime", False)
+        )
+
+        def fetch_shard(shard):
+            rows = iter_records(self._shard_fetcher(shard, dimensions, metrics, kwargs), prefetch=False)
+            return self._tag_rows(shard, list(rows))
+
+        for index, rows, error in iter_concurrently(fetch_shard, shards, max_workers=max_workers):
+            if error is not None:
+                if errors is None:
+                    raise error
+                errors[shards[index]] = error
+                continue
+            yield from rows
+
+    async def aiter_report(
+        self,
+        advertiser_ids: list,
+        dimensions: list,
+        metrics: list = None,
+        start_date=None,
+        end_date=None,
+        max_workers: int = 8,
+        max_days: int = None,
+        errors: dict = None,
+        **kwargs,
+    ):
+        """
+        Same as `iter_report` for AsyncClient, an async generator.
+
+        ## Example
+
+            async for row in client.reporting.aiter_report(advertiser_ids, ["stat_time_day"], ...):
+                ...
+        """
+        shards = self.build_shards(
+            advertiser_ids, dimensions, start_date, end_date, max_days, kwargs.get("lifetime", False)
+        )
+
+        async def fetch_shard(shard):
+            fetch_page = self._shard_fetcher(shard, dimensions, metrics, kwargs)
+            rows = [row async for row in aiter_records(fetch_page, prefetch=False)]
+            return self._tag_rows(shard, rows)
+
+        async for index, rows, error in aiter_concurrently(fetch_shard, shards, max_workers=max_workers):
+            if error is not None:
+                if errors is None:
+                    raise error
+                errors[shards[index]] = error
+                continue
+            for row in rows:
+                yield row
+
+    def get_report_columns(self, *args, types: dict = None, **kwargs):
+        """
+        This method returns the rows of `iter_report` as `columnar.Columns`, built while the shards stream in.
+        The dimensions and metrics of every row become columns next to `advertiser_id`.
+
+        ## Parameters
+        - `types`: dict, optional
+            - field -> callable, metrics are returned as strings, e.g. dict(spend=float, impressions=int).
+
+        Other parameters are the same as `iter_report`. With AsyncClient an awaitable is returned.
+        """
+        if self.client.is_async:
+            return ato_columns(self.aiter_report(*args, **kwargs), types)
+        return to_columns(self.iter_report(*args, **kwargs), types)
+
+    def _shard_fetcher(self, shard: ReportShard, dimensions: list, metrics: list, kwargs: dict):
+        kwargs = dict(kwargs)
+        kwargs.pop("page", None)
+
+        def fetch_page(page):
+            return self.get_report(
+                shard.advertiser_id,
+                dimensions,
+                metrics,
+                shard.start_date,
+                shard.end_date,
+                page=page,
+                **kwargs,
+            )
+
+        return fetch_page
+
+    def _tag_rows(self, shard: ReportShard, rows: list) -> list:
+        for row in rows:
+            row.setdefault("advertiser_id", shard.advertiser_id)
+        return rows
@@ -0,0 +1,138 @@
+"""
+Automatic retries for transient errors.
+
+Backoff is exponential with full jitter so that clients that failed together don't retry together,
+and a RetryBudget shared by the clients of a process caps retries to a fraction of the calls.
+"""
+import random
+import threading
+import time
+
+from tiktok_marketing.exceptions import InternalServerError
+from tiktok_marketing.exceptions import ServiceUnavailableError
+from tiktok_marketing.exceptions import SystemError
+from tiktok_marketing.exceptions import TooManyRequestsError
+
+
+class RetryBudget:
+    """
+    Limits retries to a ratio of the calls made.
+
+    ## Parameters
+    - ratio: float, optional, default: 0.2
+        - retries allowed per call, 0.2 means one retry every five calls.
+    - min_per_second: float, optional, default: 1
+        - retries always allowed per second, so that low traffic can still retry.
+    - max_tokens: float, optional, default: 100
+        - maximum number of retries saved up.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 100) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """This method must be called once per call."""
+        with self.lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """This method returns True if a retry can be made."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.max_tokens, self.tokens + (now - self.updated_at) * self.min_per_second)
+            self.updated_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Decides which failed calls are retried and how long to wait before the next attempt.
+
+    ## Parameters
+    - max_retries: int, optional, default: 3
+    - backoff_factor: float, optional, default: 0.5
+        - the wait before retry n is a random value between 0 and backoff_factor * 2 ** n.
+    - max_backoff: float, optional, default: 30
+        - maximum wait between attempts in seconds.
+    - retry_on: tuple, optional
+        - exception classes and/or HTTP and TikTok codes that are retried,
+        default: InternalServerError, ServiceUnavailableError, SystemError (50000), TooManyRequestsError.
+    - retry_transport_errors: bool, optional, default: True
+        - retry connection errors and timeouts.
+    - idempotent_methods: tuple, optional, default: ("get", "put", "delete")
+    - idempotent_endpoints: tuple, optional, default: ("subscription/get/",)
+        - POST endpoints that only read data.
+    - budget: RetryBudget, optional
+        - shared budget, retries stop when it's exhausted.
+
+    Throttling errors are retried for any method because the API rejects the call before processing it.
+    Other errors are only retried for idempotent calls, pass `idempotent=True` to a call to override it.
+    The exception finally raised has an `attempts` list describing every failed attempt.
+    """
+
+    DEFAULT_RETRY_ON = (InternalServerError, ServiceUnavailableError, SystemError, TooManyRequestsError)
+    ALWAYS_RETRY_ON = (TooManyRequestsError,)
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_on: tuple = DEFAULT_RETRY_ON,
+        retry_transport_errors: bool = True,
+        idempotent_methods: tuple = ("get", "put", "delete"),
+        idempotent_endpoints: tuple = ("subscription/get/",),
+        budget: RetryBudget = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_exceptions = tuple(item for item in retry_on if isinstance(item, type))
+        self.retry_codes = set(item for item in retry_on if isinstance(item, int))
+        self.retry_transport_errors = retry_transport_errors
+        self.idempotent_methods = tuple(method.lower() for method in idempotent_methods)
+        self.idempotent_endpoints = tuple(idempotent_endpoints)
+        self.budget = budget
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        return method.lower() in self.idempotent_methods or endpoint in self.idempotent_endpoints
+
+    def is_retryable(self, error: Exception, transport: bool = False) -> bool:
+        if transport:
+            return self.retry_transport_errors
+        if isinstance(error, self.retry_exceptions):
+            return True
+        return getattr(error, "code", None) in self.retry_codes
+
+    def should_retry(self, error: Exception, retries: int, idempotent: bool, transport: bool = False) -> bool:
+        """
+        This method returns True if the call must be retried.
+
+        ## Parameters
+        - error: Exception
+        - retries: int
+            - retries already made.
+        - idempotent: bool
+            - whether the call can be safely replayed.
+        - transport: bool
+            - whether the error is a connection error or a timeout.
+        """
+        if retries >= self.max_retries or not self.is_retryable(error, transport):
+            return False
+        if not idempotent and not isinstance(error, self.ALWAYS_RETRY_ON):
+            return False
+        if self.budget is not None and not self.budget.withdraw():
+            return False
+        return True
+
+    def get_backoff(self, retries: int) -> float:
+        """This method returns the seconds to wait before the next attempt."""
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**retries))
@@ -0,0 +1,96 @@
+"""
+Request coalescing.
+
+Concurrent identical calls share a single in-flight request: the first caller sends it
+and the others wait for its result. Works with threads and with asyncio tasks.
+Waiting callers stop with DeadlineExceededError when their own deadline passes first.
+"""
+import copy
+import json
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from tiktok_marketing.deadline import get_timeout
+from tiktok_marketing.exceptions import DeadlineExceededError
+
+
+def build_flight_key(method: str, url: str, params: dict, access_token: str = None) -> tuple:
+    """This method returns the key identifying identical calls."""
+    return (method.lower(), url, json.dumps(params, sort_keys=True, default=str), access_token)
+
+
+class SingleFlight:
+    """
+    Shares the result of in-flight calls between callers with the same key.
+    Waiting callers receive a copy of the result so they can't change each other's data.
+
+    ## Example
+
+        client = TikTokClient(app_id, secret, single_flight=SingleFlight())
+    """
+
+    def __init__(self) -> None:
+        self.calls = {}
+        self.async_calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, func):
+        """This method calls func unless an identical call is in flight, then waits for its result."""
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+
+        if not leader:
+            try:
+                return copy.deepcopy(future.result(timeout=get_timeout(None)))
+            except FutureTimeoutError as e:
+                raise DeadlineExceededError("Deadline exceeded waiting for an identical call", None) from e
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+    async def do_async(self, key, func):
+        """
+        Same as `do` for coroutine functions, calls are shared between tasks of the same event loop.
+        The call runs in its own task, a caller that is cancelled stops waiting without cancelling it
+        for the others.
+        """
+        # asyncio is only imported by async callers, it's slow to import
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        with self.lock:
+            task = self.async_calls.get(key)
+            leader = task is None
+            if leader:
+                task = self.async_calls[key] = loop.create_task(func())
+                task.add_done_callback(lambda done: self.forget_async(key, done))
+
+        if leader:
+            return await asyncio.shield(task)
+
+        try:
+            return copy.deepcopy(await asyncio.wait_for(asyncio.shield(task), get_timeout(None)))
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceededError("Deadline exceeded waiting for an identical call", None) from e
+
+    def forget_async(self, key, task) -> None:
+        with self.lock:
+            if self.async_calls.get(key) is task:
+                del self.async_calls[key]
+        # mark the exception as retrieved when nobody was waiting for it
+        if not task.cancelled():
+            task.exception()
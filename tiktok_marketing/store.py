@@ -0,0 +1,390 @@
+"""
+Local SQLite store of pages, leads, subscriptions and advertisers.
+
+The store mirrors records returned by the modules so repeated lookups don't go over the network.
+Every record is kept as JSON next to indexed columns, writes are bulk upserts and `find` queries
+the indexed columns. It also keeps the sync watermarks used by `Pages.iter_changed_pages`,
+which stages the records of a sync in a temporary table until the sync completes.
+
+    store = EntityStore("tiktok.db")
+    store.upsert_pages(client.pages.iter_pages(advertiser_id=advertiser_id), advertiser_id=advertiser_id)
+    store.find("pages", status="PUBLISHED", title__contains="promo")
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from itertools import islice
+
+# table -> (primary key, indexed columns)
+TABLES = {
+    "pages": ("page_id", ("advertiser_id", "library_id", "status", "title", "update_time", "create_time")),
+    "leads": ("lead_id", ("page_id", "advertiser_id", "library_id", "ad_id", "create_time")),
+    "subscriptions": ("subscription_id", ("page_id", "advertiser_id", "library_id", "url")),
+    "advertisers": ("advertiser_id", ("name", "status", "currency")),
+}
+
+INDEXES = {
+    "pages": ("advertiser_id", "library_id", "status", "update_time", "title"),
+    "leads": ("page_id", "advertiser_id", "create_time"),
+    "subscriptions": ("page_id", "advertiser_id", "library_id"),
+    "advertisers": ("name",),
+}
+
+# nested objects searched for a column missing from the record
+NESTED = ("meta_data", "subscription_detail")
+
+# columns given by the caller rather than read from the record
+SCOPE_COLUMNS = ("advertiser_id", "library_id")
+
+OPERATORS = {
+    "eq": "{} = ?",
+    "ne": "{} != ?",
+    "gt": "{} > ?",
+    "gte": "{} >= ?",
+    "lt": "{} < ?",
+    "lte": "{} <= ?",
+    "contains": "{} LIKE '%' || ? || '%'",
+    "startswith": "{} LIKE ? || '%'",
+    "in": "{} IN ({})",
+}
+
+
+def iter_chunks(iterable, size: int):
+    """This generator yields lists of up to size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def to_dict(record) -> dict:
+    return record.to_dict() if hasattr(record, "to_dict") else record
+
+
+def get_field(record: dict, field: str):
+    """This method returns a field of a record, looking into its nested objects."""
+    value = record.get(field)
+    if value is None:
+        for nested in NESTED:
+            if isinstance(record.get(nested), dict) and record[nested].get(field) is not None:
+                return record[nested][field]
+        if field == "advertiser_id":
+            return record.get("id")
+    return value
+
+
+def encode(record: dict) -> str:
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+class EntityStore:
+    """
+    SQLite mirror of the API entities.
+
+    ## Parameters
+    - path: str, optional, default: ":memory:"
+        - SQLite file, the store is thread safe and can be shared by several clients.
+    - chunk_size: int, optional, default: 1000
+        - records written per statement in bulk upserts.
+    """
+
+    def __init__(self, path: str = ":memory:", chunk_size: int = 1000) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.depth = 0
+        self.create_tables()
+
+    def create_tables(self) -> None:
+        with self.transaction():
+            for table, (key, columns) in TABLES.items():
+                definitions = ", ".join(columns)
+                self.db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"({key} TEXT PRIMARY KEY, {definitions}, data TEXT, synced_at REAL)"
+                )
+                for column in INDEXES[table]:
+                    self.db.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (scope TEXT PRIMARY KEY, watermark REAL, updated_at REAL)"
+            )
+
+    @contextmanager
+    def transaction(self):
+        """
+        This context manager groups writes in one transaction, committed when the block exits
+        and rolled back on an exception. Transactions can be nested, only the outermost one commits.
+        """
+        with self.lock:
+            if self.depth == 0:
+                self.db.execute("BEGIN IMMEDIATE")
+            self.depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.db.execute("ROLLBACK")
+                raise
+            self.depth -= 1
+            if self.depth == 0:
+                self.db.execute("COMMIT")
+
+    def upsert(self, table: str, records, **scope) -> int:
+        """
+        This method inserts or replaces records in bulk and returns the number of records written.
+
+        ## Parameters
+        - table: str
+            - pages, leads, subscriptions or advertisers.
+        - records: iterable of dicts or `records.Record`
+        - scope
+            - advertiser_id and/or library_id the records belong to, when they aren't part of the records.
+        """
+        names = self.get_names(table)
+        statement = (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"{self.build_conflict_clause(table)}"
+        )
+        return self.write_rows(table, statement, records, scope)
+
+    def write_rows(self, table: str, statement: str, records, scope: dict) -> int:
+        key, columns = self.get_table(table)
+        written = 0
+        now = time.time()
+        with self.transaction():
+            for chunk in iter_chunks(records, self.chunk_size):
+                rows = [self.build_row(key, columns, to_dict(record), scope, now) for record in chunk]
+                self.db.executemany(statement, rows)
+                written += len(rows)
+        return written
+
+    def get_names(self, table: str) -> tuple:
+        key, columns = self.get_table(table)
+        return (key,) + columns + ("data", "synced_at")
+
+    def build_conflict_clause(self, table: str) -> str:
+        names = self.get_names(table)
+        # keep the stored scope when the new record doesn't have one
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, {column})"
+            if column in SCOPE_COLUMNS
+            else f"{column} = excluded.{column}"
+            for column in names[1:]
+        )
+        return f"ON CONFLICT({names[0]}) DO UPDATE SET {updates}"
+
+    def build_row(self, key: str, columns: tuple, record: dict, scope: dict, now: float) -> tuple:
+        primary_key = get_field(record, key)
+        if primary_key is None:
+            raise ValueError(f"Record without {key}: {record!r}")
+        values = [scope[column] if column in scope else get_field(record, column) for column in columns]
+        values = [self.normalize(column, value) for column, value in zip(columns, values)]
+        return (str(primary_key), *values, encode(record), now)
+
+    def upsert_pages(self, pages, advertiser_id=None, library_id=None) -> int:
+        return self.upsert("pages", pages, **self.build_scope(advertiser_id, library_id))
+
+    def upsert_leads(self, leads, advertiser_id=None, library_id=None) -> int:
+        return self.upsert("leads", leads, **self.build_scope(advertiser_id, library_id))
+
+    def upsert_subscriptions(self, subscriptions) -> int:
+        return self.upsert("subscriptions", subscriptions)
+
+    def upsert_advertisers(self, advertisers) -> int:
+        return self.upsert("advertisers", advertisers)
+
+    def build_scope(self, advertiser_id=None, library_id=None) -> dict:
+        scope = {}
+        if advertiser_id is not None:
+            scope["advertiser_id"] = advertiser_id
+        if library_id is not None:
+            scope["library_id"] = library_id
+        return scope
+
+    def get_table(self, table: str) -> tuple:
+        if table not in TABLES:
+            raise ValueError(f"Invalid table {table!r}, options: {', '.join(TABLES)}")
+        return TABLES[table]
+
+    def build_where(self, table: str, filters: dict) -> tuple:
+        """
+        This method returns the WHERE clause and parameters of `find` filters.
+        Filters are column=value or column__operator=value, see `OPERATORS`.
+        """
+        key, columns = self.get_table(table)
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            column, _, operator = name.partition("__")
+            operator = operator or ("in" if isinstance(value, (list, tuple, set, frozenset)) else "eq")
+            if column not in (key,) + columns:
+                raise ValueError(f"Invalid column {column!r} of {table}")
+            if operator not in OPERATORS:
+                raise ValueError(f"Invalid operator {operator!r}, options: {', '.join(OPERATORS)}")
+
+            if operator == "in":
+                values = [self.normalize(column, item) for item in value]
+                clauses.append(OPERATORS["in"].format(column, ", ".join("?" * len(values))))
+                params.extend(values)
+            elif value is None and operator in ("eq", "ne"):
+                clauses.append(f"{column} IS {'NOT ' if operator == 'ne' else ''}NULL")
+            else:
+                clauses.append(OPERATORS[operator].format(column))
+                params.append(self.normalize(column, value))
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def normalize(self, column: str, value):
+        # ids are stored as text so 123 and "123" match
+        if column.endswith("_id") and value is not None:
+            return str(value)
+        return value
+
+    def find(self, table: str, order_by: str = None, limit: int = None, **filters) -> list:
+        """
+        This method returns the stored records matching the filters.
+
+        ## Parameters
+        - table: str
+            - pages, leads, subscriptions or advertisers.
+        - order_by: str, optional
+            - indexed column, prefixed with - for descending order, e.g. "-update_time".
+        - limit: int, optional
+        - filters
+            - column=value, column=[values] or column__operator=value with the operators
+            eq, ne, gt, gte, lt, lte, contains, startswith and in.
+
+        ## Example
+
+            store.find("pages", advertiser_id=advertiser_id, status="PUBLISHED", title__contains="promo")
+        """
+        key, columns = self.get_table(table)
+        where, params = self.build_where(table, filters)
+        query = f"SELECT data FROM {table}{where}"
+        if order_by is not None:
+            column = order_by.lstrip("-")
+            if column not in (key,) + columns:
+                raise ValueError(f"Invalid column {column!r} of {table}")
+            query += f" ORDER BY {column} {'DESC' if order_by.startswith('-') else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get(self, table: str, key):
+        """This method returns a stored record by primary key, None when it's missing."""
+        records = self.find(table, **{self.get_table(table)[0]: key})
+        return records[0] if records else None
+
+    def count(self, table: str, **filters) -> int:
+        where, params = self.build_where(table, filters)
+        with self.lock:
+            return self.db.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+
+    def delete(self, table: str, **filters) -> int:
+        """This method deletes the records matching the filters, every record without filters."""
+        where, params = self.build_where(table, filters)
+        with self.transaction():
+            return self.db.execute(f"DELETE FROM {table}{where}", params).rowcount
+
+    def filter_changed(self, table: str, records: list, staging: str = None) -> list:
+        """
+        This method returns the records that are not stored or differ from the stored copy.
+        With a staging table the staged copy is compared instead of the stored one, a record
+        repeated in records is only returned again if it changed.
+        """
+        key, _ = self.get_table(table)
+        records = [to_dict(record) for record in records]
+        keys = [str(get_field(record, key)) for record in records]
+        stored = {}
+        with self.lock:
+            for source in (table, staging) if staging is not None else (table,):
+                for chunk in iter_chunks(set(keys), 500):
+                    rows = self.db.execute(
+                        f"SELECT {key}, data FROM {source} WHERE {key} IN ({', '.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    stored.update((row[0], row[1]) for row in rows)
+
+        changed = []
+        for key, record in zip(keys, records):
+            data = encode(record)
+            if stored.get(key) != data:
+                stored[key] = data
+                changed.append(record)
+        return changed
+
+    def create_staging(self, table: str) -> str:
+        """
+        This method creates a temporary table with the columns of table and returns its name.
+        Records written with `stage` stay out of table until `merge_staging`, drop it with `drop_staging`.
+        """
+        key, columns = self.get_table(table)
+        staging = f"staging_{table}_{uuid.uuid4().hex}"
+        with self.lock:
+            self.db.execute(
+                f"CREATE TEMP TABLE {staging} ({key} TEXT PRIMARY KEY, {', '.join(columns)}, data TEXT, synced_at REAL)"
+            )
+        return staging
+
+    def stage(self, staging: str, table: str, records, **scope) -> int:
+        """This method upserts records of table into a staging table, see `upsert` for the parameters."""
+        names = self.get_names(table)
+        statement = (
+            f"INSERT INTO {staging} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"{self.build_conflict_clause(table)}"
+        )
+        return self.write_rows(table, statement, records, scope)
+
+    def merge_staging(self, staging: str, table: str) -> int:
+        """This method upserts the staged records into table and returns the number of records merged."""
+        names = ", ".join(self.get_names(table))
+        with self.transaction():
+            # WHERE true lets SQLite parse the upsert clause after a SELECT
+            return self.db.execute(
+                f"INSERT INTO {table} ({names}) SELECT {names} FROM {staging} WHERE true "
+                f"{self.build_conflict_clause(table)}"
+            ).rowcount
+
+    def drop_staging(self, staging: str) -> None:
+        with self.lock:
+            self.db.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+
+    def get_watermark(self, scope: str):
+        """This method returns the watermark of a sync scope, None before the first sync."""
+        with self.lock:
+            row = self.db.execute("SELECT watermark FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, scope: str, watermark: float) -> None:
+        with self.transaction():
+            self.db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (scope, watermark, time.time()),
+            )
+
+    def reset_watermark(self, scope: str = None) -> None:
+        """This method forgets a sync watermark, every watermark if no scope is given."""
+        with self.transaction():
+            self.db.execute("DELETE FROM sync_state WHERE (? IS NULL OR scope = ?)", (scope, scope))
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,134 @@
+"""
+Multi-tenant access to the API.
+
+A TenantPool serves many access tokens from one process. Every tenant gets its own
+lightweight TikTokClient, and all of them share one connection pool, rate limiter, cache and single-flight.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from tiktok_marketing.api import TikTokClient
+
+
+class TenantPool:
+    """
+    Per-token clients sharing the same transport.
+
+    ## Parameters
+    - app_id: str
+    - secret: str
+    - facade_class: type, optional, default: TikTokClient
+        - use AsyncTikTokClient for asyncio.
+    - max_tenants: int, optional, default: 10000
+        - least recently used tenants are evicted past this number.
+    - idle_timeout: float, optional, default: 900
+        - tenants not used for this many seconds are evicted.
+    - session: optional
+        - connection pool to use, by default one is created and closed with the pool.
+    - session_options: dict, optional
+        - arguments of `create_session` of the client class, e.g. pool_maxsize.
+    - kwargs
+        - other client arguments shared by every tenant, e.g. rate_limiter, retry_policy, cache, single_flight.
+
+    ## Example
+
+        pool = TenantPool(app_id, secret, rate_limiter=RateLimiter(key=("access_token",)))
+        pool.get(access_token).pages.get_pages(advertiser_id=advertiser_id)
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        secret: str,
+        facade_class: type = TikTokClient,
+        max_tenants: int = 10000,
+        idle_timeout: float = 900.0,
+        session=None,
+        session_options: dict = None,
+        **kwargs,
+    ) -> None:
+        self.app_id = app_id
+        self.secret = secret
+        self.facade_class = facade_class
+        self.max_tenants = max_tenants
+        self.idle_timeout = idle_timeout
+        self._owns_session = session is None
+        if session is None:
+            session = facade_class.client_class.create_session(**(session_options or {}))
+        self.session = session
+        self.template = facade_class(app_id, secret, session=session, **kwargs)
+        self.tenants = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, access_token: str) -> TikTokClient:
+        """This method returns the client of a tenant, it's created on first use."""
+        now = time.monotonic()
+        with self.lock:
+            self._evict_idle(now)
+            entry = self.tenants.get(access_token)
+            if entry is None:
+                facade = self.template.with_token(access_token)
+            else:
+                facade = entry[0]
+            self.tenants[access_token] = (facade, now)
+            self.tenants.move_to_end(access_token)
+            while len(self.tenants) > self.max_tenants:
+                self.tenants.popitem(last=False)
+            return facade
+
+    def __getitem__(self, access_token: str) -> TikTokClient:
+        return self.get(access_token)
+
+    def __len__(self) -> int:
+        return len(self.tenants)
+
+    def __contains__(self, access_token: str) -> bool:
+        return access_token in self.tenants
+
+    def evict_idle(self) -> None:
+        """This method removes the tenants that weren't used for idle_timeout seconds."""
+        with self.lock:
+            self._evict_idle(time.monotonic())
+
+    def _evict_idle(self, now: float) -> None:
+        # tenants are ordered by last use, the idle ones are at the front
+        while self.tenants:
+            access_token, (facade, last_used) = next(iter(self.tenants.items()))
+            if now - last_used < self.idle_timeout:
+                return
+            del self.tenants[access_token]
+
+    def evict(self, access_token: str) -> None:
+        """This method removes a tenant, e.g. when its token is revoked."""
+        with self.lock:
+            self.tenants.pop(access_token, None)
+
+    def close(self):
+        """
+        This method removes every tenant and closes the connection pool if the pool created it.
+        With AsyncTikTokClient an awaitable is returned.
+        """
+        with self.lock:
+            self.tenants.clear()
+        if not self._owns_session:
+            return None
+        if hasattr(self.session, "aclose"):
+            return self.session.aclose()
+        return self.session.close()
+
+    def __enter__(self):
+        if self.template.client.is_async:
+            raise TypeError("Use 'async with' with a TenantPool of AsyncTikTokClient.")
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        closing = self.close()
+        if closing is not None:
+            await closing
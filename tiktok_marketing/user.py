@@ -1,4 +1,3 @@
-from ast import Mod
 from tiktok_marketing.module import Module
 
 
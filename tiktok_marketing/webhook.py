@@ -0,0 +1,448 @@
+"""
+Receiver for the lead callbacks registered with `Leads.subscribe_to_leads`.
+
+Callbacks are acknowledged as soon as they are parsed and queued,
+leads are processed by a pool of workers that drain a bounded queue.
+A callback is queued whole or not at all: when the queue has no room for all of its leads
+the receiver answers 503 so TikTok delivers the callback later, max_queue must be larger
+than the biggest callback.
+
+## Example
+
+    def handle(lead):
+        ...
+
+    webhook = LeadWebhook(handle, workers=8, max_queue=10000)
+    webhook.serve(port=8000)  # or mount `webhook` in any WSGI server, or `webhook.asgi` in an ASGI server
+
+Run a local receiver that logs leads with `python -m tiktok_marketing.webhook --port 8000`.
+"""
+import abc
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler
+from wsgiref.simple_server import WSGIServer
+from wsgiref.simple_server import make_server
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidPayloadError(ValueError):
+    pass
+
+
+class WebhookStats:
+    """Thread safe counters of a receiver."""
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.received = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.processed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return dict(
+                received=self.received,
+                accepted=self.accepted,
+                rejected=self.rejected,
+                invalid=self.invalid,
+                processed=self.processed,
+                failed=self.failed,
+                uptime=elapsed,
+                processed_per_second=self.processed / elapsed,
+            )
+
+
+class BaseLeadWebhook(abc.ABC):
+    """Payload parsing, routing and stats shared by the sync and async receivers."""
+
+    def __init__(self, handler, max_queue: int = 10000, path: str = None, stats_path: str = "/stats") -> None:
+        self.handler = handler
+        self.max_queue = max_queue
+        self.path = path
+        self.stats_path = stats_path
+        self.counters = WebhookStats()
+
+    def parse(self, body: bytes) -> list:
+        """
+        This method returns the leads of a callback body.
+        A body can be a lead object, a list of leads or an object with an `entry` list of leads.
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise InvalidPayloadError("Body is not valid JSON.") from e
+
+        if isinstance(payload, dict) and isinstance(payload.get("entry"), list):
+            leads = payload["entry"]
+        elif isinstance(payload, list):
+            leads = payload
+        else:
+            leads = [payload]
+
+        if not leads or not all(isinstance(lead, dict) for lead in leads):
+            raise InvalidPayloadError("Leads must be JSON objects.")
+        return leads
+
+    @abc.abstractmethod
+    def queue_depth(self) -> int:
+        """This method returns the number of leads waiting in the queue."""
+
+    def has_room(self, leads: list) -> bool:
+        """This method returns whether all the leads of a callback fit in the queue."""
+        if len(leads) > self.max_queue:
+            logger.warning("Callback with %s leads can't fit in a queue of %s", len(leads), self.max_queue)
+        return self.max_queue - self.queue_depth() >= len(leads)
+
+    def reject(self, leads: list) -> int:
+        self.counters.increment("rejected", len(leads))
+        return 503
+
+    def stats(self) -> dict:
+        """This method returns the counters, the queue depth and the throughput of the receiver."""
+        stats = self.counters.as_dict()
+        stats.update(queue_depth=self.queue_depth(), max_queue=self.max_queue)
+        return stats
+
+    def route(self, method: str, path: str):
+        """This method returns the name of the action for a request, None for unknown routes."""
+        if method == "GET" and path == self.stats_path:
+            return "stats"
+        if method == "POST" and (self.path is None or path == self.path):
+            return "callback"
+        return None
+
+    def handle_lead(self, lead: dict) -> None:
+        try:
+            self.handler(lead)
+        except Exception:
+            self.counters.increment("failed")
+            logger.exception("Lead handler failed")
+        else:
+            self.counters.increment("processed")
+
+
+class LeadWebhook(BaseLeadWebhook):
+    """
+    WSGI (and ASGI) receiver that hands leads to a pool of worker threads.
+
+    ## Parameters
+    - handler: callable
+        - called with every lead dict by the workers.
+    - workers: int, optional, default: 4
+    - max_queue: int, optional, default: 10000
+        - leads waiting to be processed, callbacks are rejected with 503 when it's full.
+    - put_timeout: float, optional, default: 0
+        - seconds a callback waits for room for all of its leads before being rejected.
+    - path: str, optional
+        - only accept callbacks on this path, any path by default.
+    - stats_path: str, optional, default: /stats
+        - GET this path to read the stats as JSON.
+    """
+
+    def __init__(
+        self,
+        handler,
+        workers: int = 4,
+        max_queue: int = 10000,
+        put_timeout: float = 0.0,
+        path: str = None,
+        stats_path: str = "/stats",
+    ) -> None:
+        super().__init__(handler, max_queue=max_queue, path=path, stats_path=stats_path)
+        self.workers = workers
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.threads = []
+        self.lock = threading.Lock()
+        self.admission_lock = threading.Lock()
+
+    def start(self) -> None:
+        """This method starts the workers, it's called on the first callback."""
+        with self.lock:
+            if self.threads:
+                return
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self.work, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def stop(self, timeout: float = None) -> None:
+        """This method processes the queued leads and stops the workers."""
+        with self.lock:
+            threads, self.threads = self.threads, []
+        for _ in threads:
+            self.queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def work(self) -> None:
+        while True:
+            lead = self.queue.get()
+            try:
+                if lead is None:
+                    return
+                self.handle_lead(lead)
+            finally:
+                self.queue.task_done()
+
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    def submit(self, body: bytes, block: bool = True) -> int:
+        """
+        This method parses a callback body and queues its leads.
+
+        ## Returns
+        - int, HTTP status: 200 if queued, 400 if invalid, 503 if the queue has no room for every lead,
+        then none of them is queued.
+        """
+        self.start()
+        self.counters.increment("received")
+        try:
+            leads = self.parse(body)
+        except InvalidPayloadError:
+            self.counters.increment("invalid")
+            return 400
+
+        timeout = self.put_timeout if block else 0.0
+        deadline = time.monotonic() + timeout
+        # only submitters add leads, so the room found under the lock can't be taken by another callback
+        with self.admission_lock:
+            while not self.has_room(leads):
+                if len(leads) > self.max_queue or time.monotonic() >= deadline:
+                    return self.reject(leads)
+                time.sleep(min(0.01, max(0.0, deadline - time.monotonic())))
+            for lead in leads:
+                self.queue.put_nowait(lead)
+
+        self.counters.increment("accepted", len(leads))
+        return 200
+
+    def dispatch(self, method: str, path: str, body: bytes, block: bool = True):
+        """This method returns (status, body) for a request."""
+        action = self.route(method, path)
+        if action == "stats":
+            return 200, self.stats()
+        if action == "callback":
+            status = self.submit(body, block=block)
+            return status, dict(code=0 if status == 200 else status)
+        return 404, dict(code=404)
+
+    def __call__(self, environ, start_response):
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        body = environ["wsgi.input"].read(length) if length > 0 else b""
+        status, payload = self.dispatch(environ["REQUEST_METHOD"], environ.get("PATH_INFO", "/"), body)
+        return send_wsgi_response(start_response, status, payload)
+
+    async def asgi(self, scope, receive, send):
+        """ASGI application, leads are still processed by the worker threads."""
+        if scope["type"] != "http":
+            return
+        body = await read_asgi_body(receive)
+        status, payload = self.dispatch(scope["method"], scope["path"], body, block=False)
+        await send_asgi_response(send, status, payload)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """This method runs a local threaded HTTP server until interrupted."""
+        serve(self, host, port)
+        self.stop()
+
+
+class AsyncLeadWebhook(BaseLeadWebhook):
+    """
+    ASGI receiver that hands leads to async consumers.
+
+    ## Parameters
+    - handler: coroutine function
+        - awaited with every lead dict by the consumers.
+    - consumers: int, optional, default: 16
+    - max_queue, path and stats_path are the same as `LeadWebhook`.
+    """
+
+    def __init__(
+        self,
+        handler,
+        consumers: int = 16,
+        max_queue: int = 10000,
+        path: str = None,
+        stats_path: str = "/stats",
+    ) -> None:
+        super().__init__(handler, max_queue=max_queue, path=path, stats_path=stats_path)
+        self.consumers = consumers
+        self.queue = None
+        self.tasks = []
+
+    def start(self) -> None:
+        """This method starts the consumers on the running event loop, it's called on the first callback."""
+        if self.tasks:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.tasks = [asyncio.ensure_future(self.consume()) for _ in range(self.consumers)]
+
+    async def stop(self) -> None:
+        """This method processes the queued leads and stops the consumers."""
+        if not self.tasks:
+            return
+        await self.queue.join()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def consume(self) -> None:
+        while True:
+            lead = await self.queue.get()
+            try:
+                await self.handle_lead(lead)
+            finally:
+                self.queue.task_done()
+
+    async def handle_lead(self, lead: dict) -> None:
+        try:
+            await self.handler(lead)
+        except Exception:
+            self.counters.increment("failed")
+            logger.exception("Lead handler failed")
+        else:
+            self.counters.increment("processed")
+
+    def queue_depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    def submit(self, body: bytes) -> int:
+        """Same as `LeadWebhook.submit`, it never blocks."""
+        self.start()
+        self.counters.increment("received")
+        try:
+            leads = self.parse(body)
+        except InvalidPayloadError:
+            self.counters.increment("invalid")
+            return 400
+
+        # there's no await between the check and the puts, so no other callback can take the room
+        if not self.has_room(leads):
+            return self.reject(leads)
+        for lead in leads:
+            self.queue.put_nowait(lead)
+
+        self.counters.increment("accepted", len(leads))
+        return 200
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        body = await read_asgi_body(receive)
+        action = self.route(scope["method"], scope["path"])
+        if action == "stats":
+            status, payload = 200, self.stats()
+        elif action == "callback":
+            status = self.submit(body)
+            payload = dict(code=0 if status == 200 else status)
+        else:
+            status, payload = 404, dict(code=404)
+        await send_asgi_response(send, status, payload)
+
+    async def lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+def build_headers(status: int, body: bytes) -> list:
+    headers = [("Content-Type", "application/json"), ("Content-Length", str(len(body)))]
+    if status == 503:
+        headers.append(("Retry-After", "1"))
+    return headers
+
+
+def send_wsgi_response(start_response, status: int, payload: dict) -> list:
+    body = json.dumps(payload).encode()
+    start_response(f"{status} {STATUS_REASONS.get(status, '')}", build_headers(status, body))
+    return [body]
+
+
+async def read_asgi_body(receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def send_asgi_response(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    headers = [(name.lower().encode(), value.encode()) for name, value in build_headers(status, body)]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def serve(app, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """This method serves a WSGI app with a threaded HTTP server until interrupted."""
+    with make_server(
+        host,
+        port,
+        app,
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietWSGIRequestHandler,
+    ) as server:
+        logger.info("Listening for lead callbacks on http://%s:%s", host, server.server_port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local receiver for TikTok lead callbacks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    LeadWebhook(lambda lead: logger.info("Lead: %s", lead), workers=args.workers).serve(args.host, args.port)